@@ -0,0 +1,87 @@
+import json
+from os import environ
+from typing import List
+
+from yapeco import BaseEnvironment as Env
+from yapeco import TrackedValue
+from yapeco.access import (
+    access_counts,
+    access_report,
+    measure_overhead,
+    reset_access_counts,
+    write_access_report,
+)
+
+
+def test_access_counts() -> None:
+    environ.clear()
+    environ["HOST"] = "localhost"
+    environ["PORT"] = "5432"
+    environ["IDS"] = ",".join(str(i) for i in range(1000))
+
+    class Config(Env, track_access=True):
+        host: str
+        port: int
+        ids: List[int]
+        name: str = "app"
+
+    assert isinstance(Config.__dict__["host"], TrackedValue)
+    for _ in range(3):
+        assert Config.host == "localhost"
+    assert Config().port == 5432
+    assert access_counts(Config) == {"host": 3, "port": 1, "ids": 0, "name": 0}
+
+    # refreshes keep the counters
+    environ["PORT"] = "6432"
+    Config.refresh()
+    assert Config.port == 6432
+    assert access_counts(Config)["port"] == 2
+
+    report = access_report(Config, hot=1)
+    assert [f["field"] for f in report["hot"]] == ["host"]
+    assert {f["field"] for f in report["never_read"]} == {"ids", "name"}
+    # the list is costlier to parse than the default
+    assert [f["field"] for f in report["lazy_candidates"]] == ["ids", "name"]
+    assert [f["lazy_type"] for f in report["lazy_candidates"]] == [
+        "LazySequence[int]",
+        None,
+    ]
+
+    reset_access_counts(Config)
+    assert set(access_counts(Config).values()) == {0}
+
+
+def test_untracked_by_default_and_inherited() -> None:
+    environ.clear()
+    environ["HOST"] = "localhost"
+
+    class Plain(Env):
+        host: str
+
+    class Parent(Env, track_access=True):
+        pass
+
+    class Child(Parent):
+        host: str
+
+    assert Plain.__dict__["host"] == "localhost"
+    assert access_counts(Plain) == {}
+    assert Child.host == "localhost" and access_counts(Child) == {"host": 1}
+    # instances loaded from a mapping aren't tracked
+    assert Child.load({"HOST": "other"}).host == "other"
+    assert access_counts(Child) == {"host": 1}
+
+
+def test_write_report_and_overhead(tmp_path) -> None:
+    environ.clear()
+
+    class Config(Env, track_access=True):
+        name: str = "app"
+
+    path = tmp_path / "access.json"
+    write_access_report(str(path), Config)
+    assert json.loads(path.read_text())["never_read"][0]["field"] == "name"
+
+    overhead = measure_overhead(iterations=1000)
+    assert overhead["tracked_ns"] > 0
+    assert overhead["overhead_ns"] < 5000
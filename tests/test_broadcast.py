@@ -0,0 +1,115 @@
+import os
+import socket
+import time
+from os import environ
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco.broadcast import Coordinator, Worker
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets"
+)
+
+
+def make_config(autoload: bool) -> type:
+    # same module:qualname each time, like the same class in another process
+    class Config(Env, autoload=autoload):
+        host: str
+        port: int
+
+    return Config
+
+
+def wait_until(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_broadcast_deltas_and_resync(tmp_path) -> None:
+    environ.clear()
+    environ["HOST"] = "a.local"
+    environ["PORT"] = "1"
+    source, target = make_config(True), make_config(False)
+    path = str(tmp_path / "config.sock")
+
+    coordinator = Coordinator(path, source)
+    coordinator.start()
+    worker = Worker(path, target, reconnect_interval=0.01)
+    worker.start()
+    try:
+        wait_until(lambda: worker.generation == coordinator.generation)
+        assert (target.host, target.port) == ("a.local", 1)
+
+        environ["PORT"] = "2"
+        assert coordinator.refresh() == {}
+        generation = coordinator.generation
+        wait_until(lambda: worker.generation == generation)
+        assert (target.host, target.port) == ("a.local", 2)
+        # applied, not parsed from the worker's environment
+        assert target.__yapeco_raw__ is None
+
+        # a worker that missed a generation asks for a full snapshot
+        assert not worker.apply("delta", worker.generation + 2, {})
+        worker.generation -= 1
+        environ["HOST"] = "b.local"
+        coordinator.refresh()
+        wait_until(lambda: worker.resyncs == 1)
+        wait_until(lambda: worker.generation == coordinator.generation)
+        assert target.host == "b.local"
+
+        # nothing changed: no new generation
+        assert coordinator.publish() == coordinator.generation
+    finally:
+        coordinator.stop()
+
+    # a restarted coordinator: the worker reconnects and resynchronises
+    environ["PORT"] = "3"
+    source.refresh()
+    coordinator = Coordinator(path, source)
+    coordinator.start()
+    try:
+        wait_until(lambda: target.port == 3)
+    finally:
+        worker.stop()
+        coordinator.stop()
+    assert not os.path.exists(path)
+
+
+def test_coordinator_never_blocks_or_unpickles(tmp_path) -> None:
+    environ.clear()
+    environ["HOST"] = "a.local"
+    environ["PORT"] = "1"
+    source = make_config(True)
+    path = str(tmp_path / "config.sock")
+
+    coordinator = Coordinator(path, source, max_buffer=4096)
+    coordinator.start()
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+        # anything but the resync frame drops the worker
+        rogue = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        rogue.connect(path)
+        wait_until(lambda: len(coordinator._clients) == 1)
+        rogue.sendall(b"\0\0\0\x05junk!")
+        wait_until(lambda: not coordinator._clients)
+        rogue.close()
+
+        # a worker that stops reading is dropped once its buffer is full,
+        # without stalling publishing
+        idle = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        idle.connect(path)
+        wait_until(lambda: len(coordinator._clients) == 1)
+        for i in range(2000):
+            environ["HOST"] = f"{i}.local" * 20
+            coordinator.refresh()
+            if not coordinator._clients:
+                break
+        assert not coordinator._clients, "backed up worker not dropped"
+        idle.close()
+    finally:
+        coordinator.stop()
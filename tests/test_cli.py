@@ -0,0 +1,92 @@
+import json
+import sys
+from os import environ
+
+import pytest
+
+from yapeco.cli import main
+from yapeco.envfile import parse_env_lines
+
+CONFIG_MODULE = """
+from typing import List
+from yapeco import BaseEnvironment
+
+class Config(BaseEnvironment):
+    profile_host: str
+    profile_ids: List[int]
+    profile_debug: bool = False
+"""
+
+
+def test_parse_env_lines() -> None:
+    text = "# comment\n\nexport A=1\nB = 'two words'\nC=\"x=y\"\nnot a pair\nD=\n"
+    assert parse_env_lines(text) == {"A": "1", "B": "two words", "C": "x=y", "D": ""}
+
+
+def test_profile_json(tmp_path, monkeypatch, capsys) -> None:
+    environ.clear()
+    (tmp_path / "profiled_config.py").write_text(CONFIG_MODULE)
+    env_file = tmp_path / ".env"
+    env_file.write_text("PROFILE_HOST=localhost\nPROFILE_IDS=1,2,3,4,5,6,7,8\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    code = main(
+        [
+            "profile",
+            "profiled_config:Config",
+            "--env-file",
+            str(env_file),
+            "-n",
+            "5",
+            "--json",
+        ]
+    )
+    report = json.loads(capsys.readouterr().out)
+
+    assert code == 0
+    assert report["class"] == "profiled_config.Config"
+    assert report["import_ns"] > 0
+    assert {f["field"] for f in report["fields"]} == {
+        "profile_host",
+        "profile_ids",
+        "profile_debug",
+    }
+    assert report["largest_values"][0] == {"varname": "PROFILE_IDS", "raw_size": 15}
+    assert report["refresh"]["iterations"] == 5
+    metrics = sys.modules["profiled_config"].Config.__yapeco_metrics__
+    assert metrics.fields_changed >= 5 * 3, "profiled refreshes skipped parsing"
+
+
+def test_profile_bad_arguments(capsys) -> None:
+    with pytest.raises(ValueError, match="package.module:Class"):
+        main(["profile", "no_class_part"])
+    with pytest.raises(SystemExit):
+        main(["profile", "profiled_config:Config", "-n", "0"])
+    assert "must be at least 1" in capsys.readouterr().err
+
+
+def test_contention_json(tmp_path, monkeypatch, capsys) -> None:
+    environ.clear()
+    (tmp_path / "contended_config.py").write_text(CONFIG_MODULE)
+    env_file = tmp_path / ".env"
+    env_file.write_text("PROFILE_HOST=localhost\nPROFILE_IDS=1,2,3\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    code = main(
+        [
+            "contention",
+            "contended_config:Config",
+            "--env-file",
+            str(env_file),
+            "-r",
+            "2",
+            "-d",
+            "0.2",
+            "--json",
+        ]
+    )
+    assert code == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["readers"] == 2
+    assert report["refreshes"] > 0 and report["reads"] > 0
+    assert report["p50_ns"] <= report["p99_ns"] <= report["max_ns"]
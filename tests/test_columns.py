@@ -0,0 +1,73 @@
+from array import array
+from enum import Enum
+from os import environ
+from typing import List, Optional
+
+from yapeco import BaseEnvironment as Env
+
+
+class Tier(Enum):
+    FREE = "free"
+    PRO = "pro"
+
+
+def test_load_columns() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        name: str
+        port: int
+        ratio: Optional[float]
+        debug: bool = False
+        tier: Tier
+        tags: Optional[List[str]]
+
+    rows = [
+        {"NAME": "svc-a", "PORT": "80", "RATIO": "0.5", "TIER": "free"},
+        {"NAME": "svc-b", "PORT": "nope", "DEBUG": "1", "TIER": "pro", "TAGS": "x"},
+        {"NAME": "svc-a", "PORT": "443", "TIER": "gold"},
+    ]
+    columns = Config.load_columns(rows)
+
+    assert len(columns) == 3
+    assert isinstance(columns["port"].values, array)
+    assert isinstance(columns["debug"].values, array)
+    assert isinstance(columns["ratio"].values, array)
+    assert list(columns["port"]) == [80, None, 443]
+    assert list(columns["ratio"]) == [0.5, None, None]
+    assert list(columns["debug"]) == [False, True, False]
+    assert list(columns["tier"]) == [Tier.FREE, Tier.PRO, None]
+    assert list(columns["tier"].values[:2]) == [0, 1]
+    assert list(columns["tags"]) == [None, ["x"], None]
+    assert columns["name"].values[0] is columns["name"].values[2], "not interned"
+
+    assert columns.failed_rows() == [1, 2]
+    assert [(e.row, e.field) for e in columns.errors] == [(1, "port"), (2, "tier")]
+    assert isinstance(columns.errors[0].error, ValueError)
+    assert columns.row(0)["name"] == "svc-a"
+
+
+def test_load_columns_int_overflow() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        big: int
+
+    columns = Config.load_columns([{"BIG": "1"}, {"BIG": str(2**70)}])
+    assert list(columns["big"]) == [1, 2**70]
+    assert not columns.errors
+
+
+def test_load_columns_bad_default() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        tier: Tier = "free"  # type: ignore[assignment]
+        port: int = "80"  # type: ignore[assignment]
+
+    columns = Config.load_columns([{"TIER": "pro", "PORT": "1"}, {}])
+    assert list(columns["tier"]) == [Tier.PRO, None]
+    assert list(columns["port"]) == [1, None]
+    assert [(e.row, e.field) for e in columns.errors] == [(1, "tier"), (1, "port")]
+    assert isinstance(columns.errors[0].error, KeyError)
+    assert isinstance(columns.errors[1].error, TypeError)
@@ -0,0 +1,100 @@
+import re
+from os import environ
+
+from yapeco import BaseEnvironment as Env
+from yapeco import computed
+
+
+def test_computed_fields_memoised_and_invalidated() -> None:
+    environ.clear()
+    environ["HOST"] = "localhost"
+    environ["PORT"] = "5432"
+    environ["PATTERN"] = "^a+$"
+    environ["UNRELATED"] = "1"
+    calls = []
+
+    class Config(Env):
+        host: str
+        port: int
+        pattern: str
+        unrelated: str
+
+        @computed
+        def dsn(self) -> str:
+            calls.append("dsn")
+            return f"postgres://{self.host}:{self.port}"
+
+        @computed
+        def regex(self):
+            calls.append("regex")
+            return re.compile(self.pattern)
+
+        @computed
+        def banner(self) -> str:
+            calls.append("banner")
+            return f"db at {self.dsn}"
+
+    assert Config.dsn == "postgres://localhost:5432"
+    assert Config.dsn == "postgres://localhost:5432"
+    assert Config.regex.match("aaa")
+    assert Config.banner == "db at postgres://localhost:5432"
+    assert calls == ["dsn", "regex", "banner"]
+    assert Config.__dict__["dsn"].dependencies(Config) == ("host", "port")
+
+    # unrelated change: nothing recomputed
+    environ["UNRELATED"] = "2"
+    Config.refresh()
+    assert Config.dsn == "postgres://localhost:5432"
+    assert Config.banner == "db at postgres://localhost:5432"
+    assert calls == ["dsn", "regex", "banner"]
+
+    environ["PORT"] = "6543"
+    Config.refresh()
+    assert Config.regex.match("aaa")
+    assert Config.banner == "db at postgres://localhost:6543"
+    assert calls == ["dsn", "regex", "banner", "dsn", "banner"]
+
+
+def test_computed_fields_on_instances_and_subclasses() -> None:
+    environ.clear()
+    environ["NAME"] = "base"
+
+    class Base(Env):
+        name: str
+
+    class Child(Base):
+        @computed
+        def greeting(self) -> str:
+            return f"hello {self.name}"
+
+    assert Child.greeting == "hello base"
+    environ["NAME"] = "changed"
+    Base.refresh()
+    assert Child.greeting == "hello changed", "inherited dependency not tracked"
+
+    tenant = Child.load({"NAME": "tenant"})
+    assert tenant.greeting == "hello tenant"
+    assert Child.greeting == "hello changed"
+
+
+def test_computed_fields_depending_on_groups() -> None:
+    environ.clear()
+    environ["DB_HOST"] = "a"
+    environ["DB_PORT"] = "1"
+
+    class Db(Env, autoload=False):
+        host: str
+        port: int
+
+    class Config(Env):
+        db: Db
+
+        @computed
+        def dsn(self) -> str:
+            return f"{self.db.host}:{self.db.port}"
+
+    assert Config.dsn == "a:1"
+    assert Config.__dict__["dsn"].dependencies(Config) == ("db.host", "db.port")
+    environ["DB_HOST"] = "b"
+    Config.refresh()
+    assert Config.dsn == "b:1", "stale after the group was refreshed in place"
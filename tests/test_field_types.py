@@ -0,0 +1,79 @@
+import gc
+import threading
+import weakref
+from enum import Enum
+from os import environ
+from typing import List, Optional
+
+from yapeco import BaseEnvironment as Env
+from yapeco import resolve_field_type
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Fresh(Enum):
+    """Only resolved by `test_concurrent_field_type_resolution`."""
+
+    X = "x"
+
+
+def test_field_types_resolved_once() -> None:
+    assert resolve_field_type(Optional[int]) is resolve_field_type(Optional[int])
+    assert resolve_field_type(List[str]) is resolve_field_type(List[str])
+    assert resolve_field_type(Color) is resolve_field_type(Color)
+
+    resolved = resolve_field_type(Optional[List[float]])
+    assert resolved.optional and resolved.base == List[float]
+    assert resolved.parse is not None and resolved.parse("1, 2") == [1.0, 2.0]
+    assert resolve_field_type(set).parse is None
+
+    environ.clear()
+    environ["SHARED"] = "1"
+
+    class A(Env):
+        shared: Optional[int]
+
+    class B(Env):
+        shared: Optional[int]
+
+    assert A.__yapeco_plan__.fields[0].type is B.__yapeco_plan__.fields[0].type
+
+
+def test_concurrent_field_type_resolution() -> None:
+    annotation = Optional[Fresh]
+    barrier = threading.Barrier(8)
+    results = []
+
+    def resolve() -> None:
+        barrier.wait()
+        results.append(resolve_field_type(annotation))
+
+    threads = [threading.Thread(target=resolve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(r is results[0] for r in results)
+
+
+def test_local_annotations_not_kept_alive() -> None:
+    environ.clear()
+    environ["MODE"] = "a"
+
+    def make() -> type:
+        class Mode(Enum):
+            A = "a"
+
+        class Config(Env):
+            # (not `Optional[Mode]`: typing caches that itself)
+            mode: Mode
+
+        return Mode
+
+    modes = [weakref.ref(make()) for _ in range(10)]
+    gc.collect()
+    assert all(mode() is None for mode in modes)
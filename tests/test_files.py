@@ -0,0 +1,78 @@
+import os
+import pickle
+from os import environ
+from typing import Optional
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco.files import FileLines, FileSet
+from yapeco.snapshot import take_snapshot
+
+
+def _replace(path, text: str, mtime_ns: int) -> None:
+    tmp = str(path) + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.utime(tmp, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp, path)
+
+
+def test_file_backed_fields(tmp_path) -> None:
+    ips = tmp_path / "ips.txt"
+    _replace(ips, "10.0.0.1\n 10.0.0.2 \n\n10.0.0.1\r\n", 1_000_000_000)
+    tenants = tmp_path / "tenants.txt"
+    _replace(tenants, "t1\nt2\nt3", 1_000_000_000)
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+
+    environ.clear()
+    environ["ALLOWED_IPS"] = str(ips)
+    environ["TENANTS"] = str(tenants)
+    environ["EMPTY"] = str(empty)
+
+    class Config(Env):
+        allowed_ips: FileSet
+        tenants: FileLines
+        empty: FileSet
+        missing: Optional[FileSet]
+
+    allowed = Config.allowed_ips
+    assert "10.0.0.2" in allowed and "10.0.0.3" not in allowed
+    assert len(allowed) == 2
+    assert allowed == {"10.0.0.1", "10.0.0.2"}
+    assert list(Config.tenants) == ["t1", "t2", "t3"]
+    assert Config.tenants[-1] == "t3" and Config.tenants[:2] == ["t1", "t2"]
+    assert len(Config.tenants) == 3
+    assert len(Config.empty) == 0
+    assert Config.missing is None
+
+    # unchanged file: same object, index reused
+    Config.refresh()
+    assert Config.allowed_ips is allowed
+    assert Config.__yapeco_generation__ == 1
+    before = take_snapshot(Config)
+    stale = pickle.dumps(allowed)
+
+    _replace(ips, "10.0.0.3\n", 2_000_000_000)
+    Config.refresh()
+    assert Config.allowed_ips is not allowed
+    assert Config.allowed_ips == {"10.0.0.3"}
+    assert Config.__yapeco_generation__ == 2
+    # same path, new contents: a different snapshot
+    assert take_snapshot(Config) != before
+
+    restored = pickle.loads(pickle.dumps(Config.allowed_ips))
+    assert restored is Config.allowed_ips
+    with pytest.raises(ValueError, match="changed since"):
+        pickle.loads(stale)
+
+
+def test_missing_file(tmp_path) -> None:
+    environ.clear()
+    environ["LIST_FILE"] = str(tmp_path / "nope.txt")
+
+    with pytest.raises(FileNotFoundError):
+
+        class Config(Env):
+            list_file: FileLines
@@ -0,0 +1,145 @@
+import os
+import signal
+import threading
+import time
+from os import environ
+
+import pytest
+
+import yapeco
+from yapeco import BaseEnvironment as Env
+from yapeco import intern_table
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+
+
+def _in_child(func) -> str:
+    """Run `func` in a forked child, returning what it returned (as str)."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        try:
+            result = str(func())
+        except BaseException as e:
+            result = f"error: {e!r}"
+        os.write(write_fd, result.encode())
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        result = f.read()
+    os.waitpid(pid, 0)
+    return result
+
+
+def test_refresh_in_child_reuses_inherited_state() -> None:
+    environ.clear()
+    environ["FORK_VALUE"] = "x" * 100
+    environ["FORK_IDS"] = "1, 2"
+
+    class Config(Env):
+        fork_value: str
+        fork_ids: list[int]
+
+    ids = Config.fork_ids
+
+    def child() -> bool:
+        Config.refresh()
+        return Config.fork_ids is ids and Config.__yapeco_generation__ == 1
+
+    assert _in_child(child) == "True"
+
+
+def test_locks_reset_in_child() -> None:
+    # simulate other threads holding yapeco's locks at the time of fork()
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_locks() -> None:
+        with yapeco._field_types_lock, intern_table._lock:
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold_locks)
+    thread.start()
+    held.wait()
+    try:
+
+        def child() -> bool:
+            acquired = yapeco._field_types_lock.acquire(timeout=1)
+            return acquired and intern_table._lock.acquire(timeout=1)
+
+        assert _in_child(child) == "True"
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_sighup_refresher_restarted_in_child() -> None:
+    refresher = yapeco.SighupRefresher()
+    refresher.start()
+    yapeco._sighup_refresher = refresher
+    try:
+
+        def child() -> bool:
+            # started neither by the fork hook nor by the signal handler
+            refresher._handle(signal.SIGHUP, None)
+            if refresher._thread is not None or not refresher._event.is_set():
+                return False
+            refresher.trigger()
+            thread = refresher._thread
+            return thread is not None and thread.is_alive()
+
+        assert _in_child(child) == "True"
+    finally:
+        yapeco._sighup_refresher = None
+
+
+def test_broadcast_in_child(tmp_path) -> None:
+    from yapeco.broadcast import Coordinator, Worker
+
+    environ.clear()
+    environ["HOST"] = "a.local"
+
+    class Source(Env):
+        host: str
+
+    class Target(Env, autoload=False):
+        host: str
+
+    # same module:qualname on both ends
+    Target.__qualname__ = Source.__qualname__
+    path = str(tmp_path / "config.sock")
+    coordinator = Coordinator(path, Source)
+    coordinator.start()
+    worker = Worker(path, Target, reconnect_interval=0.01)
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while worker.generation != coordinator.generation:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        generation = coordinator.generation
+
+        def child() -> bool:
+            # the coordinator lock was held at fork time
+            if not coordinator._lock.acquire(timeout=1):
+                return False
+            coordinator._lock.release()
+            if coordinator._server is not None or coordinator._clients:
+                return False
+            # the worker reconnected on its own and resynchronised
+            deadline = time.monotonic() + 5
+            while worker.generation != generation:
+                if time.monotonic() > deadline:
+                    return False
+                time.sleep(0.01)
+            return worker._thread is not None and worker._thread.is_alive()
+
+        coordinator._lock.acquire()
+        threading.Timer(0.2, coordinator._lock.release).start()
+        assert _in_child(child) == "True"
+        # the child didn't remove the parent's socket
+        assert os.path.exists(path)
+    finally:
+        worker.stop()
+        coordinator.stop()
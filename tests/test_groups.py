@@ -0,0 +1,121 @@
+from os import environ
+from typing import Optional
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco import Group
+from yapeco.schema import export_schema
+
+
+class PoolConfig(Env, autoload=False):
+    size: int = 5
+
+
+class DbConfig(Env, autoload=False):
+    host: str
+    port: int = 5432
+    pool: PoolConfig
+
+
+class CacheConfig(Env, autoload=False):
+    url: Optional[str]
+
+
+def test_group_loaded_on_first_access() -> None:
+    environ.clear()
+    environ["NAME"] = "app"
+    environ["DB_HOST"] = "db.local"
+    environ["DB_POOL_SIZE"] = "10"
+
+    class Config(Env):
+        name: str
+        db: DbConfig
+        cache: CacheConfig
+
+    assert isinstance(Config.__dict__["db"], Group), "group parsed eagerly"
+    assert Config.name == "app"
+
+    db = Config.db
+    assert isinstance(db, DbConfig)
+    assert db.host == "db.local"
+    assert db.port == 5432
+    assert db.pool.size == 10
+    assert Config.db is db, "group reloaded on second access"
+    assert not hasattr(DbConfig, "host"), "group class itself should not load"
+
+
+def test_group_refresh() -> None:
+    environ.clear()
+    environ["DB_HOST"] = "one"
+
+    class Config(Env):
+        db: DbConfig
+        cache: CacheConfig
+
+    db = Config.db
+    environ["DB_HOST"] = "two"
+    Config.db.refresh()
+    assert db.host == "two", "group not refreshed independently"
+
+    environ["DB_HOST"] = "three"
+    environ["DB_POOL_SIZE"] = "1"
+    Config.refresh()
+    assert db.host == "three" and db.pool.size == 1, "touched group not refreshed"
+    assert isinstance(Config.__dict__["cache"], Group), "untouched group refreshed"
+
+    # an invalid untouched group does not break the parent's refresh
+    environ["CACHE_URL"] = ""
+    Config.refresh()
+
+
+def test_inherited_group_refresh() -> None:
+    environ.clear()
+    environ["DB_HOST"] = "a"
+
+    class Parent(Env):
+        db: DbConfig
+
+    class Child(Parent):
+        pass
+
+    assert Child.db.host == "a"
+    assert "db" in Child.__dict__, "inherited group not loaded into subclass"
+    environ["DB_HOST"] = "b"
+    Child.refresh()
+    assert Child.db.host == "b", "inherited group not refreshed"
+
+
+def test_inherited_group_loaded_per_class() -> None:
+    environ.clear()
+    environ["DB_HOST"] = "parent"
+
+    class Parent(Env):
+        db: DbConfig
+
+    assert Parent.db.host == "parent"
+
+    class Child(Parent, source={"DB_HOST": "child-source"}):
+        pass
+
+    # not the parent's instance, although that was loaded first
+    assert Child.db.host == "child-source"
+    assert Parent.db.host == "parent"
+
+
+def test_group_errors_and_instances() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        db: DbConfig
+
+    with pytest.raises(RuntimeError, match="`DB_HOST`"):
+        Config.db
+
+    tenant = Config.load({"DB_HOST": "tenant-db", "DB_PORT": "1"})
+    assert tenant.db.host == "tenant-db" and tenant.db.port == 1
+    with pytest.raises(TypeError, match="refreshable source"):
+        Config.load({"DB_HOST": "x"}).refresh()
+
+    varnames = [f["varname"] for f in export_schema(Config)["fields"]]
+    assert varnames == ["DB_HOST", "DB_PORT", "DB_POOL_SIZE"]
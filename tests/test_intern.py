@@ -0,0 +1,88 @@
+from os import environ
+from typing import List, Optional
+
+from yapeco import BaseEnvironment as Env
+from yapeco import InternTable, intern_table
+
+
+def test_values_shared_between_classes() -> None:
+    environ.clear()
+    environ["INTERN_TEST"] = "x" * 1000
+    environ["INTERN_NUMBER"] = str(2**100)
+    environ["INTERN_LIST"] = "a,b"
+
+    configs = [
+        type(
+            f"InternConfig{i}",
+            (Env,),
+            {
+                "__annotations__": {
+                    "intern_test": str,
+                    "intern_number": Optional[int],
+                    "intern_list": List[str],
+                }
+            },
+        )
+        for i in range(10)
+    ]
+
+    first = configs[0]
+    for config in configs[1:]:
+        assert config.intern_test is first.intern_test
+        assert config.intern_number is first.intern_number
+        # mutable values are never shared
+        assert config.intern_list == first.intern_list
+        assert config.intern_list is not first.intern_list
+
+    environ["INTERN_TEST"] = "changed"
+    first.refresh()
+    assert first.intern_test == "changed"
+    assert configs[1].intern_test == "x" * 1000
+
+
+def test_intern_table_bounded() -> None:
+    table = InternTable(maxsize=3)
+    for i in range(5):
+        assert table.put(("V", int, str(i)), i) == i
+    assert len(table) == 3
+    assert table.get(("V", int, "0")) is None, "oldest entry not evicted"
+    assert table.get(("V", int, "4")) == 4
+
+    existing = table.get(("V", int, "3"))
+    assert table.put(("V", int, "3"), 3.0) is existing
+
+    disabled = InternTable(maxsize=0)
+    disabled.put(("V", int, "1"), 1)
+    assert len(disabled) == 0
+
+
+def test_default_intern_table_is_bounded() -> None:
+    environ.clear()
+    for i in range(intern_table.maxsize + 10):
+        environ[f"BOUNDED_{i}"] = str(i)
+    type(
+        "BoundedConfig",
+        (Env,),
+        {"__annotations__": {f"bounded_{i}": int for i in range(len(environ))}},
+    )
+    assert len(intern_table) == intern_table.maxsize
+
+
+def test_only_class_refreshes_intern() -> None:
+    environ.clear()
+    intern_table.clear()
+    environ["SHORT"] = "short"
+    environ["LONG"] = "x" * (intern_table.max_length + 1)
+
+    class Config(Env):
+        short: str
+        long: str
+
+    assert len(intern_table) == 1
+
+    class Loaded(Env, autoload=False):
+        loaded: str
+
+    list(Loaded.load_many([{"LOADED": str(i)} for i in range(10)]))
+    Loaded.load_columns([{"LOADED": "a"}])
+    assert len(intern_table) == 1
@@ -0,0 +1,77 @@
+import json
+import sys
+from os import environ
+from typing import Optional
+
+import pytest
+
+import yapeco as y
+from yapeco import BaseEnvironment as Env
+from yapeco import LazyJsonObject
+
+
+def test_lazy_json_decodes_on_first_access() -> None:
+    environ.clear()
+    environ["PAYLOAD"] = '{"routes": {"a": [1, 2]}, "n": 3}'
+    environ["LIST_PAYLOAD"] = "[1, 2]"
+
+    class Config(Env):
+        payload: LazyJsonObject
+        list_payload: LazyJsonObject
+        missing: Optional[LazyJsonObject]
+
+    payload = Config.payload
+    assert not payload.decoded
+    assert sys.getsizeof(payload) < 100, "unused payload should only hold raw"
+    assert payload["n"] == 3
+    assert payload.decoded
+    assert isinstance(payload["routes"], y.JsonObject)
+    assert "routes" in payload and payload.get("x") is None
+    assert payload == {"routes": {"a": [1, 2]}, "n": 3}
+    assert list(Config.list_payload) == [1, 2]
+    assert Config.missing is None
+
+    # unchanged raw value: same object, decoded value stays cached
+    Config.refresh()
+    assert Config.payload is payload and payload.decoded
+
+    environ["PAYLOAD"] = '{"n": 4}'
+    Config.refresh()
+    assert Config.payload is not payload
+    assert not Config.payload.decoded
+    assert Config.payload["n"] == 4
+
+
+def test_lazy_json_validation() -> None:
+    environ.clear()
+    environ["SHALLOW"] = '{"broken": }'
+
+    class Shallow(Env):
+        shallow: LazyJsonObject
+
+    with pytest.raises(json.JSONDecodeError):
+        Shallow.shallow["broken"]
+
+    environ["SHALLOW"] = "not json"
+    with pytest.raises(json.JSONDecodeError):
+        Shallow.refresh()
+
+    class FullJson(LazyJsonObject):
+        validate = "full"
+
+    class UncheckedJson(LazyJsonObject):
+        validate = "none"
+
+    environ["FULL"] = '{"broken": }'
+    with pytest.raises(json.JSONDecodeError):
+
+        class Full(Env):
+            full: FullJson
+
+    environ["UNCHECKED"] = "not json"
+
+    class Unchecked(Env):
+        unchecked: UncheckedJson
+
+    assert isinstance(Unchecked.unchecked, UncheckedJson)
+    assert Unchecked.unchecked.raw == "not json"
@@ -0,0 +1,55 @@
+import pickle
+from os import environ
+from typing import Optional
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco import LazySequence
+from yapeco.schema import export_schema, validate_environ
+
+
+def test_lazy_sequence_fields() -> None:
+    environ.clear()
+    environ["PORTS"] = "80, 443,8080"
+    environ["HOSTS"] = "a.local,b.local"
+    environ["EMPTY"] = ""
+
+    class Config(Env):
+        ports: LazySequence[int]
+        hosts: LazySequence[str]
+        empty: Optional[LazySequence[int]]
+        missing: Optional[LazySequence[int]]
+
+    assert isinstance(Config.ports, LazySequence)
+    assert Config.ports.raw == "80, 443,8080"
+    assert len(Config.ports) == 3
+    assert list(Config.ports) == [80, 443, 8080]
+    assert Config.ports[1] == 443 and Config.ports[-1] == 8080
+    assert Config.hosts == ["a.local", "b.local"]
+    assert len(Config.empty) == 0 and list(Config.empty) == []
+    assert Config.missing is None
+    assert pickle.loads(pickle.dumps(Config.ports)) == Config.ports
+
+
+def test_lazy_sequence_parses_incrementally() -> None:
+    seq = LazySequence(int, "1,2,x," + ",".join(["3"] * 1000))
+    assert len(seq) == 1003
+    it = iter(seq)
+    assert next(it) == 1 and next(it) == 2
+    with pytest.raises(ValueError, match=r"element 2 \('x'\)"):
+        next(it)
+    with pytest.raises(IndexError):
+        seq[1003]
+
+
+def test_lazy_sequence_schema() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        ids: LazySequence[int]
+
+    schema = export_schema(Config)
+    assert schema["fields"][0]["type"] == {"kind": "list", "element": "int"}
+    assert validate_environ(schema, {"IDS": "1,2"}) == []
+    assert len(validate_environ(schema, {"IDS": "1,x"})) == 1
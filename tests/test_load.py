@@ -0,0 +1,75 @@
+from os import environ
+from typing import List, Optional
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+
+
+def test_load_instance_from_mapping() -> None:
+    environ.clear()
+    environ["HOST"] = "class-host"
+    environ["PORT"] = "1"
+
+    class Config(Env):
+        host: str
+        port: int
+        tags: Optional[List[str]]
+        debug: bool = False
+
+    tenant = Config.load({"HOST": "tenant-host", "PORT": "8080", "TAGS": "a, b"})
+
+    assert isinstance(tenant, Config)
+    assert tenant.host == "tenant-host"
+    assert tenant.port == 8080
+    assert tenant.tags == ["a", "b"]
+    assert tenant.debug is False, "default not applied to instance"
+
+    # the class itself keeps the values loaded from the environment
+    assert Config.host == "class-host"
+    assert Config.port == 1
+
+
+def test_load_includes_inherited_fields() -> None:
+    environ.clear()
+
+    class Base(Env, autoload=False):
+        base_var: str
+
+    class Child(Base, autoload=False):
+        child_var: int
+
+    child = Child.load({"BASE_VAR": "base", "CHILD_VAR": "2"})
+    assert child.base_var == "base"
+    assert child.child_var == 2
+    assert not hasattr(Child, "child_var"), "autoload=False should not load class"
+
+
+def test_load_errors() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        required_var: str
+
+    with pytest.raises(RuntimeError, match="`REQUIRED_VAR`"):
+        Config.load({})
+    with pytest.raises(RuntimeError, match="is blank"):
+        Config.load({"REQUIRED_VAR": ""})
+
+
+def test_load_many_streams_instances() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        tenant_id: int
+        name: Optional[str]
+
+    mappings = ({"TENANT_ID": str(i), "NAME": f"t{i}"} for i in range(1000))
+    loaded = Config.load_many(mappings)
+
+    first = next(loaded)
+    assert first.tenant_id == 0 and first.name == "t0"
+    rest = list(loaded)
+    assert len(rest) == 999
+    assert [c.tenant_id for c in rest[:3]] == [1, 2, 3]
+    assert rest[-1].name == "t999"
@@ -0,0 +1,107 @@
+from os import environ
+from typing import Dict, Optional
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco import EnvMap, PrefixIndex
+
+
+def test_prefix_index() -> None:
+    index = PrefixIndex({"A_X": "", "A_": "", "A_Y_Z": "", "AB": "", "B_X": ""})
+    assert list(index.match("A_")) == ["A_X", "A_Y_Z"]
+    assert list(index.match("A_", "_Z")) == ["A_Y_Z"]
+    assert list(index.match("C_")) == []
+
+
+def test_map_fields() -> None:
+    environ.clear()
+    environ["FEATURE_NEW_UI_ENABLED"] = "true"
+    environ["FEATURE_BETA_ENABLED"] = "0"
+    environ["FEATURE_BETA_OWNER"] = "someone"
+    environ["UPSTREAM_AUTH_URL"] = "http://auth"
+    environ["UPSTREAM_BILLING_URL"] = "http://billing"
+    environ["LIMIT_USERS"] = "10"
+    environ["LIMIT_JOBS"] = ""
+
+    class Config(Env):
+        features: Dict[str, bool] = EnvMap(prefix="FEATURE_", suffix="_ENABLED")
+        upstreams: Dict[str, str] = EnvMap(prefix="UPSTREAM_", suffix="_URL")
+        limit: Dict[str, Optional[int]]
+        empty: Dict[str, int]
+
+    assert Config.features == {"NEW_UI": True, "BETA": False}
+    assert Config.upstreams == {"AUTH": "http://auth", "BILLING": "http://billing"}
+    assert Config.limit == {"USERS": 10, "JOBS": None}
+    assert Config.empty == {}
+
+    environ["FEATURE_DARK_MODE_ENABLED"] = "1"
+    del environ["FEATURE_BETA_ENABLED"]
+    Config.refresh()
+    assert Config.features == {"NEW_UI": True, "DARK_MODE": True}
+
+    tenant = Config.load({"UPSTREAM_X_URL": "http://x"})
+    assert tenant.upstreams == {"X": "http://x"}
+    assert tenant.features == {}
+
+
+def test_map_field_errors() -> None:
+    environ.clear()
+    environ["PORT_HTTP"] = "http"
+
+    with pytest.raises(ValueError):
+
+        class Config(Env):
+            port: Dict[str, int]
+
+    environ["PORT_HTTP"] = ""
+    with pytest.raises(RuntimeError, match="`PORT_HTTP` is blank"):
+
+        class Config2(Env):
+            port: Dict[str, int]
+
+
+def test_map_fields_in_schema_provenance_and_columns() -> None:
+    from yapeco.schema import export_schema, validate_environ
+    from yapeco.sources import DictLayer, LayeredSource, provenance
+
+    environ.clear()
+    source = LayeredSource(
+        DictLayer("defaults", {"LIMIT_USERS": "10"}),
+        DictLayer("overrides", {"LIMIT_JOBS": "2"}),
+    )
+
+    class Config(Env, source=source):
+        limit: Dict[str, int]
+
+    assert Config.limit == {"USERS": 10, "JOBS": 2}
+    assert provenance(Config) == {
+        "limit[JOBS]": "overrides",
+        "limit[USERS]": "defaults",
+    }
+
+    # only the variables of the last parse are kept
+    map_field = Config.__yapeco_plan__.maps[0]
+    for i in range(100):
+        Config.load({f"LIMIT_T{i}": "1"})
+    assert list(map_field._entries) == ["LIMIT_T99"]
+
+    schema = export_schema(Config)
+    assert schema["maps"] == [
+        {
+            "name": "limit",
+            "prefix": "LIMIT_",
+            "suffix": "",
+            "annotation": "<class 'int'>",
+            "optional": False,
+            "type": {"kind": "int"},
+        }
+    ]
+    assert validate_environ(schema, {"LIMIT_A": "1"}) == []
+    assert validate_environ(schema, {"LIMIT_A": "x", "LIMIT_B": "1"}) == [
+        "LIMIT_A: ValueError: invalid literal for int() with base 10: 'x'"
+    ]
+
+    columns = Config.load_columns([{"LIMIT_A": "1"}, {"LIMIT_A": "x"}, {}])
+    assert list(columns["limit"]) == [{"A": 1}, None, {}]
+    assert [(e.row, e.field) for e in columns.errors] == [(1, "limit")]
@@ -0,0 +1,116 @@
+"""
+Retained-memory budgets, measured with tracemalloc. Budgets are about twice
+the footprint measured when they were recorded, so they only trip on real
+regressions (e.g. a heavier `BaseEnvironment` subclass or a refresh leak).
+"""
+
+import gc
+import tracemalloc
+from os import environ
+from typing import Any, Callable, List, Optional, Set
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco import JsonObject, LazyJsonObject, LazySequence
+from yapeco.snapshot import take_snapshot
+
+# bytes retained per class with five scalar/list fields
+CLASS_BUDGET = 8 * 1024
+# bytes retained per snapshot of that class
+SNAPSHOT_BUDGET = 1024
+# bytes retained in total by 2000 refreshes of a warmed-up class
+REFRESH_BUDGET = 16 * 1024
+# bytes retained per class with one field of the given type, in bytes per
+# element of the 10000-element value for collection and JSON types
+SCALAR_FIELD_BUDGET = 6 * 1024
+ELEMENTS = 10_000
+ELEMENT_BUDGETS = {
+    "list": 64,
+    "set": 128,
+    "lazy_sequence": 8,
+    "json": 64,
+    "lazy_json": 8,
+}
+
+FIELDS = {"host": str, "port": int, "debug": bool, "ratio": float, "tags": List[str]}
+
+
+def retained(make: Callable[[int], Any], n: int) -> float:
+    """Average bytes still allocated per object after creating `n` of them."""
+    make(-1)  # warm up caches (field types, interned values)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [make(i) for i in range(n)]
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == n
+    return (after - before) / n
+
+
+def make_class(i: int, annotations: dict) -> type:
+    return type(f"MemoryConfig{i}", (Env,), {"__annotations__": dict(annotations)})
+
+
+@pytest.fixture
+def scalar_env() -> None:
+    environ.clear()
+    environ.update({"HOST": "localhost", "PORT": "5432", "DEBUG": "1", "RATIO": "0.5"})
+    environ["TAGS"] = "a,b,c"
+
+
+def test_class_creation_budget(scalar_env: None) -> None:
+    assert retained(lambda i: make_class(i, FIELDS), 200) < CLASS_BUDGET
+
+
+def test_snapshot_budget(scalar_env: None) -> None:
+    config = make_class(0, FIELDS)
+    assert retained(lambda i: take_snapshot(config), 200) < SNAPSHOT_BUDGET
+
+
+def test_refresh_does_not_leak(scalar_env: None) -> None:
+    config = make_class(0, FIELDS)
+    for i in range(200):
+        environ["PORT"] = str(i % 3)
+        config.refresh()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(2000):
+            environ["PORT"] = str(i % 3)
+            environ["TAGS"] = "a,b" if i % 2 else "a,b,c"
+            config.refresh()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert after - before < REFRESH_BUDGET
+
+
+@pytest.mark.parametrize("annotation", [str, int, bool, float, Optional[str]])
+def test_scalar_field_budget(scalar_env: None, annotation: Any) -> None:
+    per_class = retained(lambda i: make_class(i, {"port": annotation}), 100)
+    assert per_class < SCALAR_FIELD_BUDGET
+
+
+@pytest.mark.parametrize(
+    "kind, annotation",
+    [
+        ("list", List[int]),
+        ("set", Set[int]),
+        ("lazy_sequence", LazySequence[int]),
+        ("json", JsonObject),
+        ("lazy_json", LazyJsonObject),
+    ],
+)
+def test_large_field_budget(kind: str, annotation: Any) -> None:
+    environ.clear()
+    values = ",".join(str(i) for i in range(ELEMENTS))
+    environ["VALUES"] = values if "json" not in kind else f'{{"v": [{values}]}}'
+    per_class = retained(lambda i: make_class(i, {"values": annotation}), 20)
+    assert per_class < SCALAR_FIELD_BUDGET + ELEMENTS * ELEMENT_BUDGETS[kind]
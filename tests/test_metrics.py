@@ -0,0 +1,88 @@
+from os import environ
+
+import pytest
+
+from yapeco import BaseEnvironment as Env
+from yapeco.metrics import render_metrics, write_textfile
+
+
+def test_refresh_metrics() -> None:
+    environ.clear()
+    environ["HOST"] = "localhost"
+    environ["PORT"] = "5432"
+
+    class MetricsConfig(Env):
+        host: str
+        port: int
+
+    metrics = MetricsConfig.__yapeco_metrics__
+    assert metrics.refreshes == 1 and metrics.fields_changed == 2
+    MetricsConfig.refresh()  # nothing changed
+    environ["PORT"] = "6432"
+    MetricsConfig.refresh()
+    assert metrics.refreshes == 3 and metrics.fields_changed == 3
+    assert MetricsConfig.__yapeco_generation__ == 2
+    assert metrics.last_success > 0
+
+    environ["PORT"] = "x"
+    with pytest.raises(ValueError):
+        MetricsConfig.refresh()
+    assert metrics.errors == 1 and metrics.refreshes == 3
+
+    text = render_metrics(MetricsConfig)
+    label = f'class="{__name__}.test_refresh_metrics.<locals>.MetricsConfig"'
+    assert f"yapeco_refreshes_total{{{label}}} 3\n" in text
+    assert f"yapeco_refresh_errors_total{{{label}}} 1\n" in text
+    assert f"yapeco_fields_changed_total{{{label}}} 3\n" in text
+    assert f"yapeco_generation{{{label}}} 2\n" in text
+    assert "# TYPE yapeco_refresh_duration_seconds histogram" in text
+    assert f'yapeco_refresh_duration_seconds_bucket{{{label},le="+Inf"}} 3' in text
+    assert f"yapeco_refresh_duration_seconds_count{{{label}}} 3\n" in text
+    # every config class by default
+    assert label in render_metrics()
+
+
+def test_metrics_not_inherited() -> None:
+    environ.clear()
+
+    class Parent(Env):
+        pass
+
+    class Child(Parent):
+        pass
+
+    Child.refresh()
+    assert Parent.__yapeco_metrics__.refreshes == 1
+    assert Child.__yapeco_metrics__.refreshes == 2
+
+
+def test_write_textfile(tmp_path) -> None:
+    environ.clear()
+
+    class TextfileConfig(Env):
+        pass
+
+    path = tmp_path / "yapeco.prom"
+    write_textfile(str(path), TextfileConfig)
+    assert path.read_text() == render_metrics(TextfileConfig)
+    assert [p.name for p in tmp_path.iterdir()] == ["yapeco.prom"]
+
+
+def test_same_named_classes_merged() -> None:
+    environ.clear()
+
+    def make() -> type:
+        class Made(Env):
+            pass
+
+        return Made
+
+    first, second = make(), make()
+    second.refresh()
+    text = render_metrics(first, second)
+    label = (
+        f'class="{__name__}.test_same_named_classes_merged.<locals>.make.<locals>.Made"'
+    )
+    assert text.count(f"yapeco_refreshes_total{{{label}}}") == 1
+    assert f"yapeco_refreshes_total{{{label}}} 3\n" in text
+    assert f"yapeco_refresh_duration_seconds_count{{{label}}} 3\n" in text
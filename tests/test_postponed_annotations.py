@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from enum import Enum
+from os import environ
+from typing import Dict, List, Optional
+
+import pytest
+
+import yapeco as y
+from yapeco import BaseEnvironment as Env
+
+
+class Mode(Enum):
+    DEV = "dev"
+    PROD = "prod"
+
+
+class DbConfig(Env, autoload=False):
+    host: str
+    port: int = 5432
+
+
+def test_postponed_annotations() -> None:
+    environ.clear()
+    environ["MODE"] = "prod"
+    environ["IDS"] = "1, 2"
+    environ["PAYLOAD"] = '{"a": 1}'
+    environ["DB_HOST"] = "db"
+    environ["LIMIT_X"] = "3"
+
+    class Local(Enum):
+        A = "a"
+
+    environ["LOCAL"] = "a"
+
+    class Config(Env):
+        mode: Mode
+        ids: List[int]
+        ratio: Optional[float]
+        local: Local
+        payload: y.JsonObject
+        db: DbConfig
+        limit: Dict[str, int]
+
+    assert Config.mode is Mode.PROD
+    assert Config.ids == [1, 2]
+    assert Config.ratio is None
+    assert Config.local is Local.A
+    assert Config.payload == {"a": 1}
+    assert Config.db.host == "db"
+    assert Config.limit == {"X": 3}
+
+    # resolved once: the plan holds types, not strings
+    annotations = [f.type.annotation for f in Config.__yapeco_plan__.fields]
+    assert not any(isinstance(a, str) for a in annotations)
+
+    environ["MODE"] = "dev"
+    Config.refresh()
+    assert Config.mode is Mode.DEV
+
+
+def test_postponed_annotations_inheritance() -> None:
+    environ.clear()
+    environ["BASE_VAR"] = "1"
+    environ["CHILD_VAR"] = "2"
+
+    class Base(Env):
+        base_var: int
+
+    class Child(Base):
+        child_var: Optional[int]
+
+    assert Child.base_var == 1
+    assert Child.child_var == 2
+
+
+def test_unresolvable_postponed_annotation() -> None:
+    environ.clear()
+    with pytest.raises(RuntimeError, match="Failed to resolve annotations"):
+
+        class Config(Env):
+            value: DoesNotExist  # noqa: F821
+
+
+def test_postponed_annotations_with_init_subclass_override() -> None:
+    environ.clear()
+    environ["LOCAL"] = "a"
+
+    class Local(Enum):
+        A = "a"
+
+    class Base(Env, autoload=False):
+        def __init_subclass__(cls, **kwargs) -> None:
+            super().__init_subclass__(**kwargs)
+
+    class Config(Base):
+        local: Local
+
+    assert Config.local is Local.A
@@ -0,0 +1,163 @@
+import gc
+import threading
+from os import environ
+from typing import Dict, List
+
+import yapeco
+from yapeco import BaseEnvironment as Env
+from yapeco import JsonObject, config_classes, refresh_all, resolve_field_type
+from yapeco.sources import DictLayer, LayeredSource
+
+
+def test_registry_is_weak() -> None:
+    environ.clear()
+
+    class Registered(Env):
+        pass
+
+    assert Registered in config_classes()
+    del Registered
+    gc.collect()
+    assert not any(c.__qualname__.endswith("Registered") for c in config_classes())
+
+
+def test_refresh_all() -> None:
+    environ.clear()
+    environ["SHARED_HOST"] = "a.local"
+    environ["SHARED_IDS"] = "1,2"
+    environ["HOST"] = "ignored"
+
+    class A(Env):
+        shared_host: str
+        shared_ids: List[int]
+
+    class B(Env):
+        shared_host: str
+
+    class Broken(Env):
+        shared_port: int = 1
+
+    class Unloaded(Env, autoload=False):
+        host: str
+
+    overrides = DictLayer("overrides", {"SHARED_HOST": "c.local"})
+    source = LayeredSource(overrides)
+
+    class C(Env, source=source):
+        shared_host: str
+
+    environ["SHARED_HOST"] = "b.local"
+    environ["SHARED_IDS"] = "3"
+    environ["SHARED_PORT"] = "x"
+    overrides.set("SHARED_HOST", "d.local")
+    errors = refresh_all(threads=2)
+    assert A.shared_host == "b.local" and A.shared_ids == [3]
+    # parsed once, shared
+    assert B.shared_host is A.shared_host
+    assert C.shared_host == "d.local"
+    assert not hasattr(Unloaded, "host")
+    assert isinstance(errors[Broken], ValueError)
+    assert not {A, B, C} & set(errors)
+    assert Broken.shared_port == 1
+
+
+def test_refresh_all_source_errors() -> None:
+    environ.clear()
+
+    class FailingSource(dict):
+        def refresh(self) -> None:
+            raise OSError("unreachable")
+
+    class Remote(Env, source=FailingSource(), autoload=False):
+        pass
+
+    errors = yapeco._refresh_classes([Remote], {})
+    assert isinstance(errors[Remote], OSError)
+
+
+def test_refresh_all_parses_shared_values_once(monkeypatch) -> None:
+    environ.clear()
+    environ["SHARED_IDS"] = "1,2"
+    environ["SHARED_DOC"] = '{"a": {"b": 1}}'
+
+    class A(Env):
+        shared_ids: List[int]
+        shared_doc: JsonObject
+
+    class B(Env):
+        shared_ids: List[int]
+        shared_doc: JsonObject
+
+    field_type = resolve_field_type(List[int])
+    parse, calls = field_type.parse, []
+
+    def counting(raw):
+        calls.append(raw)
+        return parse(raw)
+
+    monkeypatch.setattr(field_type, "parse", counting)
+    environ["SHARED_IDS"] = "3,4"
+    environ["SHARED_DOC"] = '{"a": {"b": 2}}'
+    assert not {A, B} & set(refresh_all())
+    assert calls == ["3,4"]
+    # mutable values are copies
+    assert A.shared_ids == B.shared_ids == [3, 4]
+    assert A.shared_ids is not B.shared_ids
+    assert A.shared_doc == B.shared_doc == {"a": {"b": 2}}
+    assert A.shared_doc["a"] is not B.shared_doc["a"]
+
+
+def test_refresh_all_indexes_each_mapping_once() -> None:
+    environ.clear()
+
+    class Source(dict):
+        iterations = 0
+
+        def __iter__(self):
+            Source.iterations += 1
+            return super().__iter__()
+
+    source = Source({"LIMIT_USERS": "1", "DB_LIMIT_JOBS": "2"})
+
+    class Db(Env, autoload=False):
+        limit: Dict[str, int]
+
+    class A(Env, source=source):
+        limit: Dict[str, int]
+        db: Db
+
+    class B(Env, source=source):
+        limit: Dict[str, int]
+        db: Db
+
+    assert A.db.limit == B.db.limit == {"JOBS": 2}
+    source["LIMIT_USERS"] = "3"
+    Source.iterations = 0
+    assert not {A, B} & set(yapeco._refresh_classes([A, B], {}))
+    assert A.limit == B.limit == {"USERS": 3}
+    # sorted once for both classes and their groups
+    assert Source.iterations == 1
+
+
+def test_refresh_all_while_classes_are_created() -> None:
+    environ.clear()
+    stop = threading.Event()
+    errors = []
+
+    def create() -> None:
+        while not stop.is_set():
+            type("Created", (Env,), {})
+
+    thread = threading.Thread(target=create)
+    thread.start()
+    try:
+        for _ in range(200):
+            try:
+                refresh_all()
+                config_classes()
+            except RuntimeError as e:
+                errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+    assert errors == []
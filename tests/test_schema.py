@@ -0,0 +1,94 @@
+import json
+from enum import Enum
+from os import environ
+from typing import TYPE_CHECKING, List, Optional
+
+import yapeco as y
+from yapeco import BaseEnvironment as Env
+from yapeco.cli import main
+from yapeco.schema import export_schema, read_schema, validate_files, write_schema
+
+if TYPE_CHECKING:
+    from typing import Literal
+else:
+    try:
+        from typing import Literal
+    except ImportError:
+        from typing_extensions import Literal
+
+
+class Mode(Enum):
+    DEV = "dev"
+    PROD = "prod"
+
+
+class Config(Env, autoload=False):
+    host: str
+    port: int = 8080
+    ratio: Optional[float]
+    ids: Optional[List[int]]
+    mode: Mode = Mode.DEV
+    level: Literal["low", "high", 3]
+    extra: Optional[y.JsonObject]
+
+
+def test_export_schema() -> None:
+    schema = export_schema(Config)
+    fields = {f["name"]: f for f in schema["fields"]}
+
+    assert schema["yapeco_schema"] == 1
+    assert fields["port"]["default"] == 8080
+    assert fields["port"]["varname"] == "PORT"
+    assert fields["ratio"]["optional"] is True
+    assert fields["ids"]["type"] == {"kind": "list", "element": "int"}
+    assert fields["mode"]["type"]["members"] == ["dev", "prod"]
+    assert fields["mode"]["default"] == "dev"
+    assert fields["level"]["type"] == {"kind": "literal", "members": ["low", "high", 3]}
+    assert fields["extra"]["type"] == {"kind": "json"}
+
+
+def test_validate_files(tmp_path) -> None:
+    environ.clear()
+    schema_path = str(tmp_path / "schema.json")
+    write_schema(Config, schema_path)
+    schema = read_schema(schema_path)
+
+    good = tmp_path / "good.env"
+    good.write_text("HOST=a\nLEVEL=3\nMODE=prod\nIDS=1,2\n")
+    bad = tmp_path / "bad.env"
+    bad.write_text("PORT=x\nLEVEL=medium\nMODE=staging\nEXTRA={\n")
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps({"HOST": "b", "LEVEL": "low"}))
+    proc = tmp_path / "environ"
+    proc.write_bytes(b"HOST=c\0LEVEL=high\0RATIO=nan\0")
+    paths = [str(p) for p in (good, bad, dump, proc)]
+
+    results = validate_files(schema, paths, processes=1)
+    assert results[str(good)] == []
+    assert results[str(dump)] == []
+    assert results[str(proc)] == []
+    assert [e.split(":")[0] for e in results[str(bad)]] == [
+        "HOST",
+        "PORT",
+        "MODE",
+        "LEVEL",
+        "EXTRA",
+    ]
+    assert "'staging' is not a valid Mode" in results[str(bad)][2]
+
+    assert validate_files(schema, paths, processes=2) == results
+
+
+def test_validate_cli(tmp_path, capsys) -> None:
+    schema_path = str(tmp_path / "schema.json")
+    write_schema(Config, schema_path)
+    env_file = tmp_path / "svc.env"
+    env_file.write_text("HOST=a\n")
+
+    code = main(["validate", schema_path, str(env_file), "-j", "1", "--json"])
+    assert code == 1
+    assert json.loads(capsys.readouterr().out) == {
+        str(env_file): [
+            "LEVEL: RuntimeError: Failed to load required environment variable `LEVEL`"
+        ]
+    }
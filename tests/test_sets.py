@@ -0,0 +1,64 @@
+from os import environ
+from typing import FrozenSet, Optional, Set
+
+from yapeco import BaseEnvironment as Env
+from yapeco.schema import export_schema, validate_environ
+
+
+def test_set_fields() -> None:
+    environ.clear()
+    environ["ALLOWED_IDS"] = "1, 2, 3, 2, 1"
+    environ["HOSTS"] = "a.local,b.local , a.local"
+    environ["RATIOS"] = "0.5"
+    environ["EMPTY"] = ""
+    environ["BUILTIN"] = "x,y"
+
+    class Config(Env):
+        allowed_ids: Set[int]
+        hosts: FrozenSet[str]
+        ratios: Optional[Set[float]]
+        empty: Optional[FrozenSet[str]]
+        missing: Optional[Set[int]]
+        builtin: frozenset[str]
+
+    assert Config.allowed_ids == {1, 2, 3}
+    assert isinstance(Config.allowed_ids, set)
+    assert Config.hosts == frozenset({"a.local", "b.local"})
+    assert isinstance(Config.hosts, frozenset)
+    assert Config.ratios == {0.5}
+    assert Config.empty == frozenset()
+    assert Config.missing is None
+    assert Config.builtin == frozenset({"x", "y"})
+
+
+def test_frozensets_shared_sets_not() -> None:
+    environ.clear()
+    environ["SHARED_IDS"] = "1,2"
+
+    class A(Env):
+        shared_ids: FrozenSet[int]
+
+    class B(Env):
+        shared_ids: FrozenSet[int]
+
+    class C(Env):
+        shared_ids: Set[int]
+
+    class D(Env):
+        shared_ids: Set[int]
+
+    assert A.shared_ids is B.shared_ids
+    assert C.shared_ids == D.shared_ids and C.shared_ids is not D.shared_ids
+
+
+def test_set_schema() -> None:
+    environ.clear()
+
+    class Config(Env, autoload=False):
+        ids: Optional[FrozenSet[int]]
+
+    schema = export_schema(Config)
+    assert schema["fields"][0]["type"] == {"kind": "frozenset", "element": "int"}
+    assert validate_environ(schema, {"IDS": "1,2"}) == []
+    assert validate_environ(schema, {"IDS": ""}) == []
+    assert len(validate_environ(schema, {"IDS": "1,x"})) == 1
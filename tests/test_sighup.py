@@ -0,0 +1,89 @@
+import os
+import signal
+import time
+from os import environ
+from typing import Iterator
+
+import pytest
+
+import yapeco
+from yapeco import BaseEnvironment as Env
+from yapeco import install_sighup_refresh
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="requires SIGHUP")
+
+
+@pytest.fixture(autouse=True)
+def restore_handler() -> Iterator[None]:
+    handler = signal.getsignal(signal.SIGHUP)
+    yield
+    signal.signal(signal.SIGHUP, handler)
+    yapeco._sighup_refresher = None
+
+
+def wait_for_passes(refresher: yapeco.SighupRefresher, passes: int) -> None:
+    deadline = time.monotonic() + 5
+    while refresher.passes < passes:
+        assert time.monotonic() < deadline, "refresh did not happen"
+        time.sleep(0.01)
+
+
+def test_sighup_refreshes_classes() -> None:
+    environ.clear()
+    environ["HOST"] = "a.local"
+    environ["PORT"] = "1"
+
+    class A(Env):
+        host: str
+
+    class B(Env):
+        port: int
+
+    refresher = install_sighup_refresh(A, B)
+    environ["HOST"] = "b.local"
+    environ["PORT"] = "2"
+    # not refreshed by the signal handler itself
+    signal.getsignal(signal.SIGHUP)(signal.SIGHUP, None)
+    wait_for_passes(refresher, 1)
+    assert A.host == "b.local" and B.port == 2
+
+    environ["PORT"] = "3"
+    os.kill(os.getpid(), signal.SIGHUP)
+    wait_for_passes(refresher, 2)
+    assert B.port == 3
+    assert install_sighup_refresh(B) is refresher and refresher.classes == [A, B]
+
+
+def test_sighup_env_file_and_errors(tmp_path) -> None:
+    environ.clear()
+    environ["PORT"] = "1"
+    environ["HOST"] = "a.local"
+
+    class A(Env):
+        port: int
+
+    class B(Env):
+        host: str
+
+    env_file = tmp_path / ".env"
+    env_file.write_text("PORT=x\nHOST=b.local\n")
+    errors = []
+    refresher = install_sighup_refresh(
+        A, B, env_file=str(env_file), on_error=errors.append
+    )
+    refresher.trigger()
+    wait_for_passes(refresher, 1)
+    # a failing class doesn't stop the others
+    assert A.port == 1 and B.host == "b.local"
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert A.__yapeco_metrics__.errors == 1
+    # read through a source: plain refreshes keep the file's values, and the
+    # environment itself is left alone
+    B.refresh()
+    assert B.host == "b.local" and environ["HOST"] == "a.local"
+
+    # variables removed from the file fall back to the environment
+    env_file.write_text("PORT=2\n")
+    refresher.trigger()
+    wait_for_passes(refresher, 2)
+    assert B.host == "a.local" and A.port == 2
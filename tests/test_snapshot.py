@@ -0,0 +1,105 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from os import environ
+from typing import Dict, List, Optional
+
+import pytest
+
+import yapeco as y
+from yapeco import BaseEnvironment as Env
+from yapeco.snapshot import Snapshot
+
+
+class Mode(Enum):
+    DEV = "dev"
+    PROD = "prod"
+
+
+class DbConfig(Env, autoload=False):
+    host: str
+
+
+def _worker_host(snapshot: Snapshot) -> str:
+    return snapshot.db.host
+
+
+def make_config():
+    class Config(Env):
+        name: str
+        ids: List[int]
+        mode: Mode = Mode.DEV
+        extra: Optional[y.JsonObject]
+        limit: Dict[str, int]
+        db: DbConfig
+
+    return Config
+
+
+def test_snapshot_is_frozen_and_hashable() -> None:
+    environ.clear()
+    environ["NAME"] = "svc"
+    environ["IDS"] = "1, 2"
+    environ["EXTRA"] = '{"a": [1]}'
+    environ["LIMIT_X"] = "3"
+    environ["DB_HOST"] = "db"
+    config = make_config()
+
+    snapshot = config.snapshot()
+    assert snapshot.name == "svc"
+    assert snapshot.ids == (1, 2)
+    assert snapshot.mode is Mode.DEV
+    assert snapshot.extra["a"] == (1,)
+    assert snapshot.limit["X"] == 3
+    assert snapshot.db.host == "db"
+    assert snapshot.generation == 1
+
+    with pytest.raises(AttributeError):
+        snapshot.name = "other"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        snapshot.extra["b"] = 1
+    with pytest.raises(AttributeError, match="no field"):
+        snapshot.missing
+
+    assert config.snapshot() == snapshot
+    assert len({snapshot, config.snapshot()}) == 1
+
+    environ["NAME"] = "changed"
+    config.refresh()
+    changed = config.snapshot()
+    assert changed != snapshot and changed.generation == 2
+
+    # a refresh without changes keeps the generation
+    config.refresh()
+    assert config.snapshot().generation == 2
+
+
+def test_snapshot_pickle() -> None:
+    environ.clear()
+    environ["NAME"] = "svc"
+    environ["IDS"] = "1"
+    environ["DB_HOST"] = "db"
+    config = make_config()
+    snapshot = config.snapshot()
+
+    data = pickle.dumps(snapshot)
+    # (a class defined in a function could not be pickled at all)
+    restored = pickle.loads(data)
+    assert restored == snapshot
+    assert restored.fingerprint == snapshot.fingerprint
+    assert restored.as_dict()["ids"] == (1,)
+    assert restored.db.host == "db"
+
+    with ProcessPoolExecutor(1) as pool:
+        assert pool.submit(_worker_host, snapshot).result() == "db"
+
+
+def test_instance_snapshot() -> None:
+    environ.clear()
+    environ["NAME"] = "svc"
+    environ["IDS"] = "1"
+    config = make_config()
+    tenant = config.load({"NAME": "t", "IDS": "5", "DB_HOST": "h"})
+    snapshot = tenant.snapshot()
+    assert snapshot.name == "t" and snapshot.db.host == "h"
+    assert snapshot.generation == 0
@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+from os import environ
+
+import pytest
+
+import yapeco
+from yapeco import BaseEnvironment as Env
+from yapeco.sources import (
+    DictLayer,
+    EnvFileLayer,
+    EnvironLayer,
+    Layer,
+    LayeredSource,
+    SqliteLayer,
+    provenance,
+)
+
+
+def test_layer_precedence_and_provenance(tmp_path) -> None:
+    environ.clear()
+    environ["PORT"] = "9000"
+    env_file = tmp_path / ".env"
+    env_file.write_text("HOST=file.local\nPORT=7000\nDEBUG=1\n")
+    overrides = DictLayer("overrides")
+    source = LayeredSource(
+        DictLayer("defaults", {"HOST": "localhost", "PORT": "8080", "DEBUG": "0"}),
+        EnvFileLayer(str(env_file), name="dotenv"),
+        EnvFileLayer(str(tmp_path / "missing.env")),
+        EnvironLayer(),
+        overrides,
+    )
+
+    class Config(Env, source=source):
+        host: str
+        port: int
+        debug: bool
+        name: str = "app"
+
+    assert (Config.host, Config.port, Config.debug) == ("file.local", 9000, True)
+    assert provenance(Config) == {
+        "host": "dotenv",
+        "port": "environ",
+        "debug": "dotenv",
+        "name": None,
+    }
+
+    overrides.set("PORT", "1234")
+    Config.refresh()
+    assert Config.port == 1234
+    assert provenance(Config)["port"] == "overrides"
+
+    overrides.unset("PORT")
+    del environ["PORT"]
+    Config.refresh()
+    assert Config.port == 7000
+    assert provenance(Config)["port"] == "dotenv"
+
+
+def test_only_changed_layers_are_remerged() -> None:
+    environ.clear()
+    low = DictLayer("low", {"A": "1", "B": "2"})
+    high = DictLayer("high", {"B": "3"})
+    source = LayeredSource(low, high)
+    assert dict(source) == {"A": "1", "B": "3"}
+    assert source.versions() == {"low": 0, "high": 0}
+
+    assert source.refresh() == set()
+    high.unset("B")
+    assert source.refresh() == {"B"}
+    assert source["B"] == "2" and source.origin("B") is low
+    high.set("A", "1")  # same merged value
+    assert source.refresh() == set()
+    assert source.origin("A") is high
+    low.update({"C": "4"})
+    assert source.refresh() == {"C"}
+    assert source.versions() == {"low": 1, "high": 2}
+
+    # readers iterating the old mapping are unaffected by a refresh
+    before = iter(source)
+    low.set("D", "5")
+    assert source.refresh() == {"D"}
+    assert sorted(before) == ["A", "B", "C"]
+
+
+def test_environ_layer_version_and_abstract_layers() -> None:
+    environ.clear()
+    layer = EnvironLayer()
+    version = layer.version()
+    assert layer.version() == version
+    environ["A"] = "1"
+    assert layer.version() != version and layer.read() == {"A": "1"}
+    with pytest.raises(TypeError):
+        Layer("abstract")  # type: ignore[abstract]
+
+
+def test_provenance_of_groups_and_errors() -> None:
+    environ.clear()
+
+    class Db(Env, autoload=False):
+        host: str
+
+    source = LayeredSource(DictLayer("defaults", {"DB_HOST": "db.local"}))
+
+    class Config(Env, source=source):
+        db: Db
+
+    assert Config.db.host == "db.local"
+    assert provenance(Config) == {"db.host": "defaults"}
+
+    class Child(Config):
+        pass
+
+    assert Child.__yapeco_env_source__ is source
+
+    class Plain(Env):
+        pass
+
+    with pytest.raises(TypeError):
+        provenance(Plain)
+
+
+def _agent_db(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.execute("CREATE TABLE config (key TEXT PRIMARY KEY, value, version INT)")
+    conn.execute("INSERT INTO config VALUES ('PORT', '8080', 1), ('HOST', 'a', 2)")
+    return conn
+
+
+def test_sqlite_layer_incremental(tmp_path) -> None:
+    environ.clear()
+    agent = _agent_db(tmp_path / "config.db")
+    layer = SqliteLayer(str(tmp_path / "config.db"), version_column="version")
+    source = LayeredSource(layer)
+
+    class Config(Env, source=source):
+        port: int
+        host: str = "localhost"
+
+    assert (Config.port, Config.host) == (8080, "a")
+    version = layer.version()
+    assert layer.version() == version  # no change: no new stamp
+
+    agent.execute("UPDATE config SET value = 9090, version = 3 WHERE key = 'PORT'")
+    agent.execute("UPDATE config SET value = NULL, version = 4 WHERE key = 'HOST'")
+    Config.refresh()
+    assert (Config.port, Config.host) == (9090, "localhost")
+    assert layer.version() == version + 1
+
+    # another thread reads through its own connection
+    result = []
+    thread = threading.Thread(target=lambda: result.append(layer.version()))
+    thread.start()
+    thread.join()
+    assert result == [version + 1]
+    assert layer._local.conn is not None
+
+    with pytest.raises(sqlite3.OperationalError):
+        layer._connection().execute("DELETE FROM config")
+
+
+def test_sqlite_layer_full_reads(tmp_path) -> None:
+    agent = _agent_db(tmp_path / "config.db")
+    layer = SqliteLayer(str(tmp_path / "config.db"), name="agent")
+    source = LayeredSource(DictLayer("defaults", {"DEBUG": "0"}), layer)
+    assert dict(source) == {"DEBUG": "0", "PORT": "8080", "HOST": "a"}
+    agent.execute("DELETE FROM config WHERE key = 'HOST'")
+    assert source.refresh() == {"HOST"}
+    assert source.origin("PORT") is layer
+
+    with pytest.raises(ValueError):
+        SqliteLayer(str(tmp_path / "config.db"), table="config; DROP TABLE x")
+
+
+def test_threaded_refreshes_reuse_connections(tmp_path, monkeypatch) -> None:
+    environ.clear()
+    _agent_db(tmp_path / "a.db")
+    _agent_db(tmp_path / "b.db")
+
+    class A(Env, source=LayeredSource(SqliteLayer(str(tmp_path / "a.db")))):
+        port: int
+
+    class B(Env, source=LayeredSource(SqliteLayer(str(tmp_path / "b.db")))):
+        port: int
+
+    connect, connections = sqlite3.connect, []
+
+    def counting(*args, **kwargs):
+        connections.append(args)
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", counting)
+    for _ in range(10):
+        assert yapeco._refresh_classes([A, B], {}, threads=2) == {}
+    # pool threads are kept, and their connections with them: at most one
+    # per thread and layer, not one per pass
+    assert len(connections) <= 2 * 2
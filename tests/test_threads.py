@@ -0,0 +1,103 @@
+import threading
+from collections.abc import Mapping
+from itertools import count
+from os import environ
+
+from yapeco import BaseEnvironment as Env
+from yapeco.snapshot import take_snapshot
+
+
+def _run(*targets) -> None:
+    # run `targets` on threads, re-raising the first exception any raised
+    errors = []
+
+    def run(target) -> None:
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class CountingSource(Mapping):
+    """A different value on every read, so that no refresh is skipped."""
+
+    def __init__(self) -> None:
+        self._count = count()
+
+    def __getitem__(self, key: str) -> str:
+        return str(next(self._count))
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+
+def test_concurrent_refreshes_are_serialised() -> None:
+    class Config(Env, source=CountingSource()):
+        thread_port: int
+
+    def refresh() -> None:
+        for _ in range(200):
+            Config.refresh()
+
+    _run(*[refresh] * 4)
+    # no lost updates
+    assert Config.__yapeco_generation__ == 1 + 4 * 200
+    assert Config.__yapeco_metrics__.refreshes == 1 + 4 * 200
+    assert Config.__yapeco_seq__ == 2 * (1 + 4 * 200)
+
+
+def test_snapshots_are_consistent_during_refreshes() -> None:
+    environ.clear()
+    environ["LOW"] = "0"
+    environ["HIGH"] = "0"
+
+    class Config(Env):
+        low: int
+        high: int
+
+    stop = threading.Event()
+    torn = []
+
+    def write() -> None:
+        try:
+            for i in range(1, 300):
+                # os.environ is process-wide; write both, then refresh
+                environ["LOW"] = environ["HIGH"] = str(i)
+                Config.refresh()
+        finally:
+            stop.set()
+
+    def read() -> None:
+        while not stop.is_set():
+            snapshot = take_snapshot(Config)
+            if snapshot.low != snapshot.high:
+                torn.append(snapshot)
+
+    _run(write, read, read, read)
+    assert torn == []
+
+
+def test_concurrent_group_loads() -> None:
+    environ.clear()
+    environ["DB_HOST"] = "db.local"
+
+    class Db(Env, autoload=False):
+        host: str
+
+    class Config(Env):
+        db: Db
+
+    seen = []
+    _run(*[lambda: seen.append(Config.db)] * 8)
+    assert all(db is Config.db for db in seen)
@@ -3,12 +3,20 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Generic,
+    Iterable,
+    Iterator,
     List,
+    Mapping,
     Optional,
+    Tuple,
+    Type,
+    TypeVar,
     Union,
     cast,
     get_args,
     get_origin,
+    get_type_hints,
 )
 
 if TYPE_CHECKING:
@@ -24,12 +32,29 @@ else:
             from typing_extensions import Literal
         except ImportError:
             Literal = None
+import os
+import signal
 import sys
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
 from enum import Enum
-from json import JSONDecoder
+from functools import partial
+from json import JSONDecodeError, JSONDecoder
 from json import loads as json_loads
-from os import getenv
+from os import environ as os_environ
 from re import compile as compile_regex
+from threading import Event, Lock, RLock, Thread
+from time import perf_counter, time
+from types import MethodType
+from weakref import WeakKeyDictionary, WeakSet
+
+try:
+    from types import UnionType  # type: ignore[attr-defined]
+
+    _union_origins: Tuple[Any, ...] = (Union, UnionType)
+except ImportError:  # Python < 3.10
+    _union_origins = (Union,)
 
 _builtin_field_re = compile_regex(r"^__[a-z][a-z0-9_]+__$")
 
@@ -53,6 +78,104 @@ class JsonObjectDecoder(JSONDecoder):
         super().__init__(*args, **kwargs)
 
 
+_UNSET: Any = object()
+
+
+class LazyJsonObject:
+    """
+    A JSON value that keeps its raw string and is only decoded (into
+    `JsonObject`s, as for `JsonObject` fields) on first access.
+
+    How the raw value is checked when loaded is set by `validate`, which
+    subclasses can override: `"shallow"` (the default) only checks that it
+    looks like a JSON object or array, `"full"` decodes it once without
+    keeping the result, and `"none"` skips checking entirely.
+    """
+
+    __slots__ = ("raw", "_value")
+
+    validate = "shallow"
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self._value = _UNSET
+
+    @property
+    def value(self) -> Any:
+        """The decoded value."""
+        if self._value is _UNSET:
+            self._value = parse_json_value(self.raw)
+        return self._value
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the value has been decoded yet."""
+        return self._value is not _UNSET
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.value[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self.value.get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyJsonObject):
+            if self.raw == other.raw:
+                return True
+            other = other.value
+        return self.value == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.raw!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.raw,))
+
+
+class _LazyJsonParser:
+    """
+    Parser for a `LazyJsonObject` type. An unchanged raw value returns the
+    previously loaded object, so its decoded value stays cached across
+    refreshes.
+    """
+
+    __slots__ = ("cls", "last")
+
+    def __init__(self, cls) -> None:
+        self.cls = cls
+        self.last: Optional[LazyJsonObject] = None
+
+    def fresh(self) -> "_LazyJsonParser":
+        return _LazyJsonParser(self.cls)
+
+    def __call__(self, value_str: str) -> LazyJsonObject:
+        last = self.last
+        if last is not None and last.raw == value_str:
+            return last
+        validate = self.cls.validate
+        if validate == "full":
+            parse_json_value(value_str)
+        elif validate == "shallow":
+            stripped = value_str.strip()
+            if stripped[:1] + stripped[-1:] not in ("{}", "[]"):
+                raise JSONDecodeError(
+                    "Expecting JSON object or array", value_str, len(value_str)
+                )
+        value = self.last = self.cls(value_str)
+        return value
+
+
 def env_value_valid(val):
     return val is not None and val != ""
 
@@ -83,7 +206,11 @@ def parse_literal_value(field_type, value_str):
         literal_values = get_args(field_type)
     else:
         literal_values = getattr(field_type, "__args__", ())
+    return match_literal_value(literal_values, value_str)
+
 
+def match_literal_value(literal_values, value_str):
+    """Parse a string value against a tuple of allowed literal values."""
     # Try to match the string directly first
     if value_str in literal_values:
         return value_str
@@ -115,121 +242,1517 @@ def parse_literal_value(field_type, value_str):
     )
 
 
+def parse_bool_value(value_str):
+    """Parse a boolean config value; anything but `false`/`0` is truthy."""
+    return value_str.lower() != "false" and value_str != "0"
+
+
+def parse_json_value(value_str):
+    """Parse a JSON config value, decoding objects as `JsonObject`."""
+    return json_loads(value_str, cls=JsonObjectDecoder)
+
+
+def _parse_list_value(typ, value_str):
+    return [typ(x.strip()) for x in value_str.split(",")]
+
+
+def _parse_set_value(typ, value_str):
+    return {typ(x.strip()) for x in value_str.split(",")}
+
+
+def _parse_frozenset_value(typ, value_str):
+    return frozenset([typ(x.strip()) for x in value_str.split(",")])
+
+
+_T = TypeVar("_T")
+
+
+class LazySequence(Generic[_T]):
+    """
+    A comma-separated value that keeps its raw string and parses elements on
+    demand, scanning for delimiters incrementally, e.g. for very long values
+    that are only iterated once. `len()` counts delimiters without parsing.
+
+        routes: LazySequence[str]
+    """
+
+    __slots__ = ("type", "raw")
+
+    def __init__(self, type: Callable[[str], Any] = str, raw: str = "") -> None:
+        self.type = type
+        self.raw = raw
+
+    def __len__(self) -> int:
+        return self.raw.count(",") + 1 if self.raw else 0
+
+    def __iter__(self) -> Iterator[Any]:
+        raw = self.raw
+        if not raw:
+            return
+        typ = self.type
+        find = raw.find
+        start = 0
+        index = 0
+        while True:
+            end = find(",", start)
+            element = raw[start:] if end < 0 else raw[start:end]
+            try:
+                value = typ(element.strip())
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    f"Invalid element {index} ({element.strip()!r}): {e}"
+                ) from e
+            yield value
+            if end < 0:
+                return
+            start = end + 1
+            index += 1
+
+    def __getitem__(self, index: int) -> Any:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("LazySequence index out of range")
+        for i, value in enumerate(self):
+            if i == index:
+                return value
+        raise IndexError("LazySequence index out of range")  # pragma: no cover
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazySequence):
+            if self.type is other.type and self.raw == other.raw:
+                return True
+            other = list(other)
+        return list(self) == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"LazySequence({getattr(self.type, '__name__', self.type)}, {self.raw!r})"
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (LazySequence, (self.type, self.raw))
+
+
+_collection_parsers = {
+    LazySequence: LazySequence,
+    list: _parse_list_value,
+    set: _parse_set_value,
+    frozenset: _parse_frozenset_value,
+}
+
+
+def _get_origin_and_args(field_type):
+    if sys.version_info >= (3, 8):
+        return get_origin(field_type), get_args(field_type)
+    return getattr(field_type, "__origin__", None), getattr(field_type, "__args__", ())
+
+
+def _type_parser(field_type) -> Optional[Callable[[str], Any]]:
+    """Return a `str -> value` parser for a (non-optional) field type, if any."""
+    if field_type is bool:
+        return parse_bool_value
+    if field_type is JsonObject:
+        return parse_json_value
+    if isinstance(field_type, type) and issubclass(field_type, LazyJsonObject):
+        return _LazyJsonParser(field_type)
+    # types providing their own parser, e.g. those in `yapeco.files`
+    if isinstance(field_type, type) and hasattr(field_type, "__yapeco_parser__"):
+        return field_type.__yapeco_parser__()
+    if is_enum_type(field_type):
+        return cast(Callable[[str], Any], field_type)
+    if is_literal_type(field_type):
+        return partial(parse_literal_value, field_type)
+    if field_type in (str, int, float):
+        return cast(Callable[[str], Any], field_type)
+    origin, args = _get_origin_and_args(field_type)
+    if origin in _collection_parsers and len(args) == 1:
+        if args[0] in (str, int, float):
+            return partial(_collection_parsers[origin], args[0])
+    return None
+
+
+# run in the child process after `fork()`, to reset locks (which may have been
+# held by another thread of the parent) and threads owned by yapeco
+_after_fork_hooks: List[Callable[[], None]] = []
+
+
+def after_fork_in_child(hook: Callable[[], None]) -> Callable[[], None]:
+    """Register `hook` to run in child processes after `fork()`."""
+    _after_fork_hooks.append(hook)
+    return hook
+
+
+def _run_after_fork_hooks() -> None:
+    for hook in list(_after_fork_hooks):
+        hook()
+
+
+if hasattr(os, "register_at_fork"):
+    # Config classes and their last raw values are inherited as-is, so the
+    # first refresh in a child only re-reads and compares raw values.
+    os.register_at_fork(after_in_child=_run_after_fork_hooks)
+
+
+class InternTable:
+    """
+    Process-wide table of parsed values keyed by `(variable, annotation, raw
+    value)`, so that classes reading the same variable share one parsed object
+    instead of each parsing and keeping their own copy.
+
+    Only immutable values parsed by class-level refreshes are interned (not
+    values loaded with `load()`, `load_many()` or `load_columns()`), and only
+    for raw values of at most `max_length` characters. The table holds at
+    most `maxsize` entries, evicting the oldest first; `maxsize=0` disables
+    interning.
+    """
+
+    __slots__ = ("maxsize", "max_length", "_values", "_lock", "__weakref__")
+
+    def __init__(self, maxsize: int = 4096, max_length: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self._values: Dict[Tuple[str, Any, str], Any] = {}
+        self._lock = Lock()
+        _intern_tables.add(self)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Tuple[str, Any, str]) -> Any:
+        return self._values.get(key)
+
+    def put(self, key: Tuple[str, Any, str], value: Any) -> Any:
+        """Intern `value`, returning the already interned value if any."""
+        if self.maxsize <= 0:
+            return value
+        values = self._values
+        with self._lock:
+            existing = values.get(key)
+            if existing is not None:
+                return existing
+            while len(values) >= self.maxsize:
+                del values[next(iter(values))]
+            values[key] = value
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+_intern_tables: "WeakSet[InternTable]" = WeakSet()
+
+
+@after_fork_in_child
+def _reset_intern_table_locks() -> None:
+    for table in list(_intern_tables):
+        table._lock = Lock()
+
+
+intern_table = InternTable()
+
+_interned_types = (str, int, float)
+
+# values worth sharing between fields within a refresh pass, by identity
+_immutable_types = (bool, str, int, float)
+_immutable_origins = (frozenset, LazySequence)
+
+
+def _same(value: Any) -> Any:
+    return value
+
+
+def _share_function(
+    base: Any, parse: Optional[Callable[[str], Any]]
+) -> Optional[Callable[[Any], Any]]:
+    # how a value parsed for one field is handed to another field reading the
+    # same raw value: as-is if immutable, else as a copy; `None` for values
+    # that are never shared (stateful parsers, unknown types)
+    if parse is None or hasattr(parse, "fresh"):
+        return None
+    if base in _immutable_types or is_enum_type(base) or is_literal_type(base):
+        return _same
+    if base is JsonObject:
+        return deepcopy
+    origin, _ = _get_origin_and_args(base)
+    if origin in _immutable_origins:
+        return _same
+    if origin in (list, set):
+        # of immutable elements
+        return copy
+    return None
+
+
+class FieldType:
+    """
+    How values for a field annotation are parsed.
+
+    `parse` is `None` for unsupported annotations; the error is deferred until
+    a value actually has to be parsed, so such fields still work with defaults.
+    """
+
+    __slots__ = (
+        "annotation",
+        "base",
+        "optional",
+        "parse",
+        "empty",
+        "intern",
+        "share",
+        "volatile",
+    )
+
+    def __init__(
+        self,
+        annotation: Any,
+        base: Any,
+        optional: bool,
+        parse: Optional[Callable[[str], Any]],
+        empty: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.annotation = annotation
+        # the annotation with `Optional[...]` stripped
+        self.base = base
+        self.optional = optional
+        self.parse = parse
+        # value of a blank optional variable (`None` unless it is a collection)
+        self.empty = empty
+        # whether parsed values are immutable and worth sharing between fields
+        self.intern = (
+            base in _interned_types or _get_origin_and_args(base)[0] is frozenset
+        )
+        # whether values can change without the raw value changing (e.g. the
+        # contents of a file named by the variable), so always re-parsed
+        self.volatile = getattr(base, "__yapeco_volatile__", False)
+        self.share = None if self.volatile else _share_function(base, parse)
+
+    def __repr__(self) -> str:
+        return f"FieldType({self.annotation!r}, optional={self.optional})"
+
+    def bind(self) -> "FieldType":
+        """
+        Return a `FieldType` for use by a single field. Field types are shared
+        between fields, except those with stateful parsers, which are copied.
+        """
+        fresh = getattr(self.parse, "fresh", None)
+        if fresh is None:
+            return self
+        return FieldType(self.annotation, self.base, self.optional, fresh(), self.empty)
+
+
+# resolved field types by annotation, shared by all classes in the process
+_field_types: Dict[Any, FieldType] = {}
+_field_types_lock = Lock()
+
+
+@after_fork_in_child
+def _reset_field_types_lock() -> None:
+    global _field_types_lock
+    _field_types_lock = Lock()
+
+
+def _is_local_annotation(annotation: Any) -> bool:
+    # whether `annotation` refers to a class defined in a function, which the
+    # field type cache would keep alive after the class using it is freed
+    if isinstance(annotation, type):
+        return "<locals>" in annotation.__qualname__
+    if isinstance(annotation, Enum):
+        return _is_local_annotation(type(annotation))
+    return any(_is_local_annotation(a) for a in _get_origin_and_args(annotation)[1])
+
+
+def resolve_field_type(field_type) -> FieldType:
+    """
+    Resolve a field annotation into a `FieldType`. Each distinct annotation is
+    only introspected once per process, except those referring to classes
+    defined in functions, which are not cached.
+    """
+    try:
+        resolved = _field_types.get(field_type)
+    except TypeError:  # unhashable annotation
+        return _resolve_field_type(field_type)
+    if resolved is None:
+        if _is_local_annotation(field_type):
+            return _resolve_field_type(field_type)
+        with _field_types_lock:
+            resolved = _field_types.get(field_type)
+            if resolved is None:
+                resolved = _field_types[field_type] = _resolve_field_type(field_type)
+    return resolved
+
+
+def _resolve_field_type(field_type) -> FieldType:
+    origin, args = _get_origin_and_args(field_type)
+    if origin in _union_origins and len(args) == 2 and type(None) in args:
+        inner_type = args[0] if args[1] is type(None) else args[1]
+        parse = _type_parser(inner_type)
+        if parse is not None:
+            inner_origin, _ = _get_origin_and_args(inner_type)
+            # empty string corresponds to an empty collection
+            empty = inner_origin if inner_origin in _collection_parsers else None
+            return FieldType(field_type, inner_type, True, parse, empty)
+    return FieldType(field_type, field_type, False, _type_parser(field_type))
+
+
+class Field:
+    """A config field: attribute name, environment variable, type and default."""
+
+    __slots__ = ("name", "varname", "type", "default")
+
+    def __init__(self, name: str, varname: str, type: FieldType, default: Any):
+        self.name = name
+        self.varname = varname
+        self.type = type
+        self.default = default
+
+    def __repr__(self) -> str:
+        return f"Field({self.name!r}, {self.varname!r}, {self.type!r})"
+
+    def load(
+        self,
+        varval: Optional[str],
+        intern: bool = False,
+        shared: Optional[Dict[Any, Any]] = None,
+    ) -> Any:
+        """
+        Parse the raw value of this field's variable (`None` if unset), sharing
+        the value through `intern_table` if `intern`, and with other fields of
+        the same refresh pass through `shared`.
+        """
+        field_type = self.type
+        if field_type.optional:
+            if varval is None:
+                return None
+            if varval == "":
+                return field_type.empty() if field_type.empty is not None else None
+        else:
+            if varval is None:
+                if self.default is not None:
+                    return self.default
+                raise RuntimeError(
+                    f"Failed to load required environment variable `{self.varname}`"
+                )
+            if varval == "":
+                raise RuntimeError(
+                    f"Environment variable `{self.varname}` is blank and not marked "
+                    f"as optional; it must have a value"
+                )
+            if field_type.parse is None:
+                raise RuntimeError(
+                    f"Unsupported type {field_type.annotation} for field {self.name}"
+                )
+
+        shared_key = None
+        if shared is not None and field_type.share is not None:
+            shared_key = (self.varname, field_type, varval)
+            v = shared.get(shared_key, _UNSET)
+            if v is not _UNSET:
+                return field_type.share(v)
+        if intern and field_type.intern and len(varval) <= intern_table.max_length:
+            key = (self.varname, field_type.annotation, varval)
+            v = intern_table.get(key)
+            if v is None:
+                v = intern_table.put(key, field_type.parse(varval))  # type: ignore[misc]
+        else:
+            v = field_type.parse(varval)  # type: ignore[misc]
+            if v is None and not field_type.optional:
+                raise RuntimeError(
+                    f"Unsupported type {field_type.annotation} for field {self.name}"
+                )
+        if shared_key is not None:
+            shared[shared_key] = v  # type: ignore[index]
+        return v
+
+
+def _own_annotations(cls) -> Dict[str, Any]:
+    if sys.version_info >= (3, 10):
+        return cls.__annotations__
+    # before 3.10 a class without annotations exposes its parent's
+    return cls.__dict__.get("__annotations__", {})
+
+
+class _Annotations:
+    """Holder for annotations passed to `get_type_hints()`."""
+
+    def __init__(self, annotations: Dict[str, Any]) -> None:
+        self.__annotations__ = annotations
+
+
+def _resolve_annotations(cls, frame: Any = None) -> Dict[str, Any]:
+    """
+    Return the annotations declared on `cls`, evaluating postponed (string)
+    annotations in the namespace of the module defining `cls`, then that of
+    the frame it was defined in (for classes defined inside functions).
+    """
+    annotations = _own_annotations(cls)
+    if not any(isinstance(a, str) for a in annotations.values()):
+        return annotations
+    module = sys.modules.get(cls.__module__)
+    globalns = dict(vars(module)) if module is not None else {}
+    localns: Dict[str, Any] = {}
+    if frame is not None and frame.f_globals is not frame.f_locals:
+        localns.update(frame.f_locals)
+    # nested classes
+    localns.update((k, v) for k, v in vars(cls).items() if isinstance(v, type))
+    try:
+        return get_type_hints(
+            _Annotations(dict(annotations)), globalns, localns, include_extras=True
+        )
+    except NameError as e:
+        raise RuntimeError(
+            f"Failed to resolve annotations of {cls.__qualname__}: {e}"
+        ) from e
+
+
+def _defining_frame(cls) -> Any:
+    """
+    From `BaseEnvironment.__init_subclass__`, the frame executing the `class`
+    statement of `cls`, past overrides of `__init_subclass__` calling
+    `super()`. `None` if it isn't in the module of `cls` (e.g. a class created
+    with `type()` elsewhere), leaving only the module namespace.
+    """
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_name == "__init_subclass__":
+        frame = frame.f_back
+    if frame is None or frame.f_globals.get("__name__") != cls.__module__:
+        return None
+    return frame
+
+
+def _is_group_type(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseEnvironment)
+
+
+def _map_value_type(annotation) -> Any:
+    """Return `T` for a `Dict[str, T]` annotation, else `None`."""
+    origin, args = _get_origin_and_args(annotation)
+    if origin is dict and len(args) == 2 and args[0] is str:
+        return args[1]
+    return None
+
+
+class PrefixIndex:
+    """
+    The sorted variable names of one environment snapshot, for finding all
+    variables with a given prefix by bisection instead of a full scan. The
+    names are only sorted on first use, so an index can be passed down a
+    refresh that may not read any map field.
+    """
+
+    __slots__ = ("_environ", "_keys")
+
+    def __init__(self, environ: Mapping[str, str]) -> None:
+        self._environ: Optional[Mapping[str, str]] = environ
+        self._keys: Optional[List[str]] = None
+
+    @property
+    def keys(self) -> List[str]:
+        keys = self._keys
+        if keys is None:
+            keys = self._keys = sorted(self._environ)  # type: ignore[arg-type]
+            self._environ = None
+        return keys
+
+    def match(self, prefix: str, suffix: str = "") -> Iterator[str]:
+        """Yield variable names of the form `<prefix><non-empty><suffix>`."""
+        keys = self.keys
+        min_len = len(prefix) + len(suffix) + 1
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            key = keys[i]
+            if not key.startswith(prefix):
+                break
+            if len(key) >= min_len and key.endswith(suffix):
+                yield key
+
+
+class EnvMap:
+    """
+    Default value marking a `Dict[str, T]` field as populated from all variables
+    matching `<prefix><KEY><suffix>`, keyed by `KEY`. The prefix defaults to
+    the field name followed by `_`:
+
+        features: Dict[str, bool] = EnvMap(prefix="FEATURE_", suffix="_ENABLED")
+    """
+
+    __slots__ = ("prefix", "suffix")
+
+    def __init__(self, prefix: Optional[str] = None, suffix: str = "") -> None:
+        self.prefix = prefix
+        self.suffix = suffix
+
+
+class MapField:
+    """A `Dict[str, T]` field populated from a prefix/suffix variable pattern."""
+
+    __slots__ = ("name", "prefix", "suffix", "type", "_entries")
+
+    def __init__(self, name: str, prefix: str, suffix: str, type: FieldType):
+        self.name = name
+        self.prefix = prefix
+        self.suffix = suffix
+        self.type = type
+        # per-variable fields of the variables seen by the last parse
+        self._entries: Dict[str, Field] = {}
+
+    def __repr__(self) -> str:
+        return f"MapField({self.name!r}, {self.prefix!r}, {self.suffix!r})"
+
+    def prefixed(self, prefix: str) -> "MapField":
+        return MapField(self.name, prefix + self.prefix, self.suffix, self.type)
+
+    def read(
+        self, environ: Mapping[str, str], index: PrefixIndex
+    ) -> Tuple[Tuple[str, str], ...]:
+        """Read the matching `(variable, raw value)` pairs of `environ`."""
+        return tuple(
+            (varname, environ[varname])
+            for varname in index.match(self.prefix, self.suffix)
+        )
+
+    def parse(
+        self,
+        items: Iterable[Tuple[str, str]],
+        intern: bool = False,
+        shared: Optional[Dict[Any, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Parse pairs returned by `read()` into the field's value."""
+        entries = self._entries
+        current = {}
+        start = len(self.prefix)
+        stop = -len(self.suffix) or None
+        values = {}
+        for varname, raw in items:
+            entry = entries.get(varname)
+            if entry is None:
+                entry = Field(self.name, varname, self.type.bind(), None)
+            current[varname] = entry
+            values[varname[start:stop]] = entry.load(raw, intern, shared)
+        # forget variables no longer set, so that this stays bounded
+        self._entries = current
+        return values
+
+
+def _load_values(fields: Iterable[Field], environ: Mapping[str, str]) -> Dict[str, Any]:
+    get = environ.get
+    return {field.name: field.load(get(field.varname)) for field in fields}
+
+
+class TrackedValue:
+    """
+    The value of a field of a class created with `track_access=True`, stored
+    on the class in place of the value itself to count reads through the
+    class (or its instances). Counts are approximate if read concurrently
+    from threads without the GIL. See `yapeco.access`.
+    """
+
+    __slots__ = ("value", "reads")
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.reads = 0
+
+    def __get__(self, obj, owner) -> Any:
+        self.reads += 1
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"TrackedValue({self.value!r}, reads={self.reads})"
+
+
+def _untracked(value: Any) -> Any:
+    return value.value if isinstance(value, TrackedValue) else value
+
+
+def _publish(namespace: Any, values: Dict[str, Any], raws: Any) -> None:
+    """
+    Set parsed `values` on `namespace` (a config class or instance), along
+    with the raw values they were parsed from. Callers serialise this per
+    namespace (see `__yapeco_lock__`).
+    """
+    state = namespace.__dict__
+    # odd while values are being published, for consistent readers (see
+    # `yapeco.snapshot`)
+    seq = state.get("__yapeco_seq__", 0)
+    if isinstance(namespace, type):
+        tracked = namespace.__yapeco_track_access__
+        namespace.__yapeco_seq__ = seq + 1
+        for name, v in values.items():
+            if tracked:
+                cell = state.get(name)
+                if isinstance(cell, TrackedValue):
+                    cell.value = v
+                    continue
+                v = TrackedValue(v)
+            setattr(namespace, name, v)
+        namespace.__yapeco_raw__ = raws
+        namespace.__yapeco_generation__ = state["__yapeco_generation__"] + 1
+        namespace.__yapeco_seq__ = seq + 2
+    else:
+        state["__yapeco_seq__"] = seq + 1
+        state.update(values)
+        state["__yapeco_raw__"] = raws
+        state["__yapeco_generation__"] = state["__yapeco_generation__"] + 1
+        state["__yapeco_seq__"] = seq + 2
+    _bump_refresh_generation()
+
+
+class Plan:
+    """The compiled fields, nested groups and map fields of a config class."""
+
+    __slots__ = ("fields", "groups", "maps", "volatile")
+
+    def __init__(
+        self,
+        fields: Tuple[Field, ...] = (),
+        groups: Tuple["Group", ...] = (),
+        maps: Tuple[MapField, ...] = (),
+    ) -> None:
+        self.fields = fields
+        self.groups = groups
+        self.maps = maps
+        # (index, field) of fields re-parsed even if their raw value is the same
+        self.volatile = tuple((i, f) for i, f in enumerate(fields) if f.type.volatile)
+
+    @classmethod
+    def compile(cls, config_cls, frame: Any = None) -> "Plan":
+        """
+        Build the plan of what is declared directly on `config_cls`, which was
+        defined in `frame` (used to resolve postponed annotations).
+        """
+        fields = []
+        groups = []
+        maps = []
+        for name, annotation in _resolve_annotations(config_cls, frame).items():
+            if _builtin_field_re.search(name) is not None:
+                continue
+            default = config_cls.__dict__.get(name, None)
+            if _is_group_type(annotation):
+                groups.append(Group(name, annotation, name.upper() + "_"))
+                continue
+            value_type = _map_value_type(annotation)
+            if value_type is not None:
+                if not isinstance(default, EnvMap):
+                    default = EnvMap()
+                prefix = default.prefix
+                if prefix is None:
+                    prefix = name.upper() + "_"
+                field_type = resolve_field_type(value_type)
+                maps.append(MapField(name, prefix, default.suffix, field_type))
+                continue
+            fields.append(
+                Field(
+                    name, name.upper(), resolve_field_type(annotation).bind(), default
+                )
+            )
+        return cls(tuple(fields), tuple(groups), tuple(maps))
+
+    @classmethod
+    def merge(cls, plans: Iterable["Plan"]) -> "Plan":
+        """Merge plans in order, later plans overriding earlier ones by name."""
+        members: Dict[str, Any] = {}
+        for plan in plans:
+            for member in plan.fields + plan.groups + plan.maps:
+                members.pop(member.name, None)
+                members[member.name] = member
+        return cls(
+            tuple(m for m in members.values() if isinstance(m, Field)),
+            tuple(m for m in members.values() if isinstance(m, Group)),
+            tuple(m for m in members.values() if isinstance(m, MapField)),
+        )
+
+    def prefixed(self, prefix: str) -> "Plan":
+        """This plan, reading variables with `prefix` prepended."""
+        return Plan(
+            tuple(
+                Field(f.name, prefix + f.varname, f.type.bind(), f.default)
+                for f in self.fields
+            ),
+            tuple(g.prefixed(prefix) for g in self.groups),
+            tuple(m.prefixed(prefix) for m in self.maps),
+        )
+
+    def read(
+        self, environ: Mapping[str, str], index: Optional[PrefixIndex] = None
+    ) -> Tuple[Any, ...]:
+        """
+        Read the raw values of all fields and map fields (but not groups) from
+        `environ`: one value (or `None`) per field, then one tuple of
+        `(variable, raw value)` pairs per map field. Pass the `index` of
+        `environ` to share it with other plans reading the same snapshot.
+        """
+        get = environ.get
+        raws = tuple([get(field.varname) for field in self.fields])
+        if self.maps:
+            if index is None:
+                index = PrefixIndex(environ)
+            raws += tuple([map_field.read(environ, index) for map_field in self.maps])
+        return raws
+
+    def parse(
+        self,
+        raws: Tuple[Any, ...],
+        intern: bool = False,
+        shared: Optional[Dict[Any, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Parse raw values returned by `read()` (see `Field.load()`)."""
+        values = {
+            field.name: field.load(raw, intern, shared)
+            for field, raw in zip(self.fields, raws)
+        }
+        if self.maps:
+            items = raws[len(self.fields) :]
+            for map_field, map_items in zip(self.maps, items):
+                values[map_field.name] = map_field.parse(map_items, intern, shared)
+        return values
+
+    def load_values(self, environ: Mapping[str, str]) -> Dict[str, Any]:
+        """Load field and map values (but not groups) from `environ`."""
+        if self.maps:
+            return self.parse(self.read(environ))
+        return _load_values(self.fields, environ)
+
+    def refresh(
+        self,
+        namespace: Any,
+        environ: Mapping[str, str],
+        shared: Optional[Dict[Any, Any]] = None,
+        index: Optional[PrefixIndex] = None,
+    ) -> int:
+        """
+        Load values from `environ` into `namespace` (a config class or
+        instance), skipping parsing if no raw value changed since the last
+        refresh. Returns the number of fields (and map fields) that changed.
+        """
+        raws = self.read(environ, index)
+        state = namespace.__dict__
+        # only values bound to classes are shared between them
+        intern = isinstance(namespace, type)
+        tracked = intern and namespace.__yapeco_track_access__
+        old = state.get("__yapeco_raw__")
+        if raws == old:
+            values = {field.name: field.load(raws[i]) for i, field in self.volatile}
+            current = {k: state.get(k) for k in values}
+            if tracked:
+                current = {k: _untracked(v) for k, v in current.items()}
+            values = {k: v for k, v in values.items() if v is not current[k]}
+            if not values:
+                return 0
+            changed = len(values)
+        else:
+            values = self.parse(raws, intern, shared)
+            if old is None:
+                changed = len(raws)
+            else:
+                changed = sum([a != b for a, b in zip(raws, old)])
+        _publish(namespace, values, raws)
+        return changed
+
+    def load_instance(self, cls, environ: Mapping[str, str]) -> Any:
+        """Load an instance of `cls`, including its groups, from `environ`."""
+        obj = object.__new__(cls)
+        values = obj.__dict__
+        values.update(self.load_values(environ))
+        if self.groups:
+            index = PrefixIndex(environ)
+            for group in self.groups:
+                values[group.name] = group.load(environ, index)
+        return obj
+
+
+class Group:
+    """
+    A nested config group field, e.g. `db: DbConfig` reading `DB_HOST` and
+    `DB_PORT` for the `host` and `port` fields of `DbConfig`.
+
+    On the owning class, a group is only loaded when it is first accessed; its
+    value is an instance of the group class, which can be refreshed on its own
+    with `Config.db.refresh()`.
+    """
+
+    __slots__ = ("name", "cls", "prefix", "plan")
+
+    def __init__(self, name: str, cls, prefix: str) -> None:
+        self.name = name
+        self.cls = cls
+        self.prefix = prefix
+        self.plan = cls.__yapeco_plan__.prefixed(prefix)
+
+    def __repr__(self) -> str:
+        return f"Group({self.name!r}, {self.cls.__qualname__}, {self.prefix!r})"
+
+    def prefixed(self, prefix: str) -> "Group":
+        return Group(self.name, self.cls, prefix + self.prefix)
+
+    def load(
+        self, environ: Mapping[str, str], index: Optional[PrefixIndex] = None
+    ) -> Any:
+        """Load an instance of the group class from `environ`."""
+        if index is None:
+            index = PrefixIndex(environ)
+        obj = object.__new__(self.cls)
+        obj.__dict__["__yapeco_source__"] = (environ, self)
+        obj.__dict__["__yapeco_generation__"] = 0
+        obj.__dict__["__yapeco_lock__"] = RLock()
+        self.plan.refresh(obj, environ, index=index)
+        for group in self.plan.groups:
+            obj.__dict__[group.name] = group.load(environ, index)
+        return obj
+
+    def __get__(self, obj, owner) -> Any:
+        # first access on the owning class: load, then replace this descriptor
+        target = owner if obj is None else obj
+        with owner.__dict__["__yapeco_lock__"]:
+            value = target.__dict__.get(self.name)
+            if value is None or isinstance(value, Group):
+                # not loaded by another thread meanwhile
+                value = self.load(_class_environ(owner))
+                setattr(target, self.name, value)
+        return value
+
+
+# incremented by every refresh that changes a value; computed fields
+# revalidate their dependencies when it changes
+_refresh_generation = 0
+_refresh_generation_lock = Lock()
+
+
+def _bump_refresh_generation() -> None:
+    global _refresh_generation
+    with _refresh_generation_lock:
+        _refresh_generation += 1
+
+
+# upper bounds (in seconds) of the refresh latency histogram buckets
+REFRESH_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class RefreshMetrics:
+    """
+    Counters for the class-level refreshes of one config class, rendered by
+    `yapeco.metrics`. Updated by the refreshing thread and read without
+    locking, so a scrape racing a refresh may see one refresh half-counted.
+    """
+
+    __slots__ = (
+        "refreshes",
+        "errors",
+        "fields_changed",
+        "last_success",
+        "buckets",
+        "duration_sum",
+    )
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+        self.errors = 0
+        self.fields_changed = 0
+        # wall-clock time of the last successful refresh, 0 if there was none
+        self.last_success = 0.0
+        # per-bucket (non-cumulative) counts; the last bucket is +Inf
+        self.buckets = [0] * (len(REFRESH_BUCKETS) + 1)
+        self.duration_sum = 0.0
+
+    def observe(self, duration: float, changed: int) -> None:
+        self.buckets[bisect_left(REFRESH_BUCKETS, duration)] += 1
+        self.duration_sum += duration
+        self.fields_changed += changed
+        self.refreshes += 1
+        self.last_success = time()
+
+
+class _Recorder:
+    """
+    Proxy passed to computed field functions, recording attributes read.
+    Groups are proxied too, their fields recorded as `group.field`: a group
+    refreshed in place stays the same object.
+    """
+
+    __slots__ = ("_target", "_reads", "_prefix")
+
+    def __init__(
+        self, target: Any, reads: Optional[Dict[str, Any]] = None, prefix: str = ""
+    ) -> None:
+        self._target = target
+        self._reads: Dict[str, Any] = {} if reads is None else reads
+        self._prefix = prefix
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if isinstance(value, BaseEnvironment):
+            return _Recorder(value, self._reads, f"{self._prefix}{name}.")
+        self._reads[self._prefix + name] = value
+        return value
+
+
+def _read_path(target: Any, name: str) -> Any:
+    # read a dependency recorded by `_Recorder`
+    if "." not in name:
+        return getattr(target, name)
+    for part in name.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class _Memo:
+    __slots__ = ("value", "deps", "generation")
+
+    def __init__(self, value: Any, deps: Dict[str, Any], generation: int) -> None:
+        self.value = value
+        self.deps = deps
+        self.generation = generation
+
+
+class ComputedField:
+    """A memoised value derived from other config fields (see `computed`)."""
+
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, owner) -> Any:
+        target = owner if obj is None else obj
+        memos = target.__dict__.get("__yapeco_computed__")
+        if memos is None:
+            memos = {}
+            if obj is None:
+                setattr(owner, "__yapeco_computed__", memos)
+            else:
+                obj.__dict__["__yapeco_computed__"] = memos
+
+        memo = memos.get(self.name)
+        generation = _refresh_generation
+        if memo is not None:
+            if memo.generation == generation:
+                return memo.value
+            # something was refreshed; keep the value if no dependency changed
+            for name, old in memo.deps.items():
+                new = _read_path(target, name)
+                if new is not old and new != old:
+                    break
+            else:
+                memo.generation = generation
+                return memo.value
+
+        recorder = _Recorder(target)
+        value = self.func(recorder)
+        memos[self.name] = _Memo(value, recorder._reads, generation)
+        return value
+
+    def dependencies(self, target: Any) -> Tuple[str, ...]:
+        """
+        Names of the attributes of `target` its memoised value was built from
+        (`group.field` for fields of groups).
+        """
+        memo = target.__dict__.get("__yapeco_computed__", {}).get(self.name)
+        return () if memo is None else tuple(memo.deps)
+
+
+def computed(func: Callable[[Any], Any]) -> ComputedField:
+    """
+    Decorate a method of a config class as a computed field. It is called with
+    the class (or instance) on first access and its result memoised, along
+    with the attributes it read. After a refresh the value is only recomputed
+    if one of those attributes changed:
+
+        class Config(Env):
+            host: str
+            port: int
+
+            @computed
+            def dsn(self) -> str:
+                return f"postgres://{self.host}:{self.port}"
+    """
+    return ComputedField(func)
+
+
+def _class_environ(cls, sync: bool = False) -> Mapping[str, str]:
+    """
+    The mapping a config class reads: its `source` (first brought up to date
+    with `source.refresh()` if `sync`), or `os.environ`.
+    """
+    source = cls.__yapeco_env_source__
+    if source is None:
+        return os_environ
+    if sync:
+        refresh = getattr(source, "refresh", None)
+        if refresh is not None:
+            refresh()
+    return source
+
+
+def _refresh_groups(
+    namespace: Any,
+    plan: Plan,
+    environ: Mapping[str, str],
+    shared: Optional[Dict[Any, Any]],
+    index: PrefixIndex,
+) -> int:
+    # refresh the loaded groups of `namespace` from `environ`
+    changed = 0
+    for group in plan.groups:
+        value = namespace.__dict__.get(group.name)
+        if value is not None and not isinstance(value, Group):
+            changed += _refresh_instance(value, group.plan, environ, shared, index)
+    return changed
+
+
+def _refresh_instance(
+    obj: Any,
+    plan: Plan,
+    environ: Mapping[str, str],
+    shared: Optional[Dict[Any, Any]] = None,
+    index: Optional[PrefixIndex] = None,
+) -> int:
+    # refresh a group instance and its groups
+    if index is None:
+        index = PrefixIndex(environ)
+    with obj.__dict__["__yapeco_lock__"]:
+        changed = plan.refresh(obj, environ, shared, index)
+        return changed + _refresh_groups(obj, plan, environ, shared, index)
+
+
+# every live config class, in creation order
+_config_classes: "WeakKeyDictionary[type, bool]" = WeakKeyDictionary()
+# taken to add classes and to copy the registry: iterating it while another
+# thread creates a class raises
+_config_classes_lock = Lock()
+
+
+def config_classes() -> List[type]:
+    """All live subclasses of `BaseEnvironment`, in creation order."""
+    with _config_classes_lock:
+        return list(_config_classes.keys())
+
+
+def _reset_refresh_locks(namespace: Any, plan: Plan) -> None:
+    if isinstance(namespace, type):
+        namespace.__yapeco_lock__ = RLock()
+    else:
+        namespace.__dict__["__yapeco_lock__"] = RLock()
+    for group in plan.groups:
+        value = namespace.__dict__.get(group.name)
+        if value is not None and not isinstance(value, Group):
+            _reset_refresh_locks(value, group.plan)
+
+
+@after_fork_in_child
+def _reset_class_locks() -> None:
+    global _refresh_generation_lock, _config_classes_lock
+    _refresh_generation_lock = Lock()
+    _config_classes_lock = Lock()
+    for cls in [BaseEnvironment] + config_classes():
+        _reset_refresh_locks(cls, cls.__dict__["__yapeco_own__"])
+
+
+def _refresh_class(
+    cls,
+    environ: Mapping[str, str],
+    shared: Optional[Dict[Any, Any]] = None,
+    index: Optional[PrefixIndex] = None,
+) -> None:
+    """
+    Refresh a config class (and its loaded groups) from `environ`, sharing
+    parsed values with other classes refreshed in the same pass through
+    `shared` (see `Field.load()`) and the `index` of `environ`.
+    """
+    if index is None:
+        index = PrefixIndex(environ)
+    metrics = cls.__dict__["__yapeco_metrics__"]
+    plan = cls.__dict__["__yapeco_own__"]
+    with cls.__dict__["__yapeco_lock__"]:
+        start = perf_counter()
+        try:
+            changed = plan.refresh(cls, environ, shared, index)
+            # inherited groups are loaded into the class on first access too
+            changed += _refresh_groups(cls, cls.__yapeco_plan__, environ, shared, index)
+        except Exception:
+            metrics.errors += 1
+            raise
+        metrics.observe(perf_counter() - start, changed)
+
+
+class _HybridMethod:
+    """Like `classmethod`, but binds to the instance when called on one."""
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.__func__ = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, owner) -> Callable[..., Any]:
+        return MethodType(self.__func__, owner if obj is None else obj)
+
+
+_E = TypeVar("_E", bound="BaseEnvironment")
+
+if TYPE_CHECKING:
+    from yapeco.columns import Columns
+    from yapeco.snapshot import Snapshot
+
+
 class BaseEnvironment:
     """
     Base class for environment-config objects.
+
+    Fields are compiled into a parsing plan once, when the subclass is created;
+    loading the class (or instances of it) only parses the raw values.
+    Pass `autoload=False` as a class keyword to skip loading the class from
+    `os.environ` at definition time, e.g. for classes only used with `load()`
+    or as nested groups, and `source=` to read another mapping than
+    `os.environ` (e.g. a `yapeco.sources.LayeredSource`), and
+    `track_access=True` to count reads of each field (`yapeco.access`; the
+    default is on if `YAPECO_TRACK_ACCESS=1`). Subclasses inherit their
+    parent's source and access tracking.
     """
 
-    def __init_subclass__(cls) -> None:
-        annotations: Dict[str, Any] = cls.__annotations__
-        fields = filter(
-            lambda x: _builtin_field_re.search(x) is None,
-            annotations.keys(),
+    # what is declared on this class
+    __yapeco_own__: Plan = Plan()
+    # everything on this class, including inherited fields
+    __yapeco_plan__: Plan = Plan()
+    # number of refreshes that changed a value of this class's own fields
+    __yapeco_generation__ = 0
+    # refresh counters of this class (see `yapeco.metrics`)
+    __yapeco_metrics__ = RefreshMetrics()
+    # whether this class is loaded from its source (see `refresh_all()`)
+    __yapeco_autoload__ = False
+    # serialises refreshes of this class (never taken to read values)
+    __yapeco_lock__ = RLock()
+    # whether reads of fields are counted (see `yapeco.access`)
+    __yapeco_track_access__ = os_environ.get("YAPECO_TRACK_ACCESS", "") == "1"
+    # mapping read instead of `os.environ` (see `yapeco.sources`)
+    __yapeco_env_source__: Optional[Mapping[str, str]] = None
+
+    def __init_subclass__(
+        cls,
+        autoload: bool = True,
+        source: Optional[Mapping[str, str]] = None,
+        track_access: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init_subclass__(**kwargs)
+        if source is not None:
+            cls.__yapeco_env_source__ = source
+        if track_access is not None:
+            cls.__yapeco_track_access__ = track_access
+        # the frame defining the class
+        cls.__yapeco_own__ = Plan.compile(cls, _defining_frame(cls))
+        cls.__yapeco_generation__ = 0
+        cls.__yapeco_metrics__ = RefreshMetrics()
+        cls.__yapeco_lock__ = RLock()
+        cls.__yapeco_autoload__ = autoload
+        cls.__yapeco_plan__ = Plan.merge(
+            base.__dict__["__yapeco_own__"]
+            for base in reversed(cls.__mro__)
+            if "__yapeco_own__" in base.__dict__
         )
-        for field in fields:
-            varname = field.upper()
-            varval = getenv(varname)
-            default_value = cls.__dict__.get(field, None)
-            field_type = (
-                annotations[field] if field in annotations else type(default_value)
+        # inherited groups too: each class loads its own instance from its own
+        # source, whether or not the parent's was loaded already
+        for group in cls.__yapeco_plan__.groups:
+            setattr(cls, group.name, group)
+        with _config_classes_lock:
+            _config_classes[cls] = autoload
+        if autoload:
+            cls.refresh()
+
+    @_HybridMethod
+    def refresh(self_or_cls) -> None:  # noqa: N805
+        """
+        Refresh the environment-config object.
+
+        Groups that have been accessed are refreshed too; groups that never
+        were are skipped. Called on a group instance (`Config.db.refresh()`),
+        refreshes only that group.
+        """
+        if isinstance(self_or_cls, type):
+            _refresh_class(self_or_cls, _class_environ(self_or_cls, sync=True))
+            return
+
+        self = self_or_cls
+        source = self.__dict__.get("__yapeco_source__")
+        if source is None:
+            raise TypeError(
+                f"{type(self).__qualname__} instance was not loaded from a "
+                f"refreshable source"
             )
-            v = None
-            optional = False
-
-            # optional case
-
-            if field_type == Optional[bool]:
-                optional = True
-                if env_value_valid(varval):
-                    assert varval is not None  # Type checker hint
-                    v = varval.lower() != "false" and varval != "0"
-            elif field_type == Optional[JsonObject]:
-                optional = True
-                if env_value_valid(varval):
-                    assert varval is not None  # Type checker hint
-                    v = json_loads(varval, cls=JsonObjectDecoder)
-            else:
-                # Check for Optional[Enum] (compatible with Python 3.9+)
-                if sys.version_info >= (3, 8):
-                    origin = get_origin(field_type)
-                    args = get_args(field_type)
-                else:
-                    origin = getattr(field_type, "__origin__", None)
-                    args = getattr(field_type, "__args__", ())
-
-                # Check if this is Optional/Union type
-                if origin is Union and len(args) == 2 and type(None) in args:
-                    inner_type = args[0] if args[1] is type(None) else args[1]
-                    if is_enum_type(inner_type):
-                        optional = True
-                        if env_value_valid(varval):
-                            v = inner_type(varval)
-                    elif is_literal_type(inner_type):
-                        optional = True
-                        if env_value_valid(varval):
-                            v = parse_literal_value(inner_type, varval)
-
-                if not optional:
-                    for typ in [str, int, float]:
-                        if field_type == Optional[typ]:
-                            optional = True
-                            if env_value_valid(varval):
-                                v = typ(varval)
-                            break
-                        elif field_type == Optional[List[typ]]:
-                            optional = True
-                            # overrides behavior of env_value_valid
-                            # (empty string corresponds to empty list)
-                            if varval == "":
-                                v = []
-                            elif varval is not None:
-                                v = list(
-                                    map(lambda x: typ(x.strip()), varval.split(","))
-                                )
-                            break
-
-            # non-optional cases
-
-            if not optional:
-                if varval is None:
-                    if default_value is not None:
-                        v = default_value
-                    else:
-                        raise RuntimeError(
-                            f"Failed to load required environment variable `{varname}`"
-                        )
-                elif varval == "":
-                    raise RuntimeError(
-                        f"Environment variable `{varname}` is blank and not marked as "
-                        f"optional; it must have a value"
-                    )
-                elif field_type is bool:
-                    v = varval.lower() != "false" and varval != "0"
-                elif field_type is JsonObject:
-                    v = json_loads(varval, cls=JsonObjectDecoder)
-                elif is_enum_type(field_type):
-                    v = cast(Callable[[str], Any], field_type)(varval)
-                elif is_literal_type(field_type):
-                    v = parse_literal_value(field_type, varval)
-                else:
-                    for typ in [str, int, float]:
-                        if field_type is typ:
-                            v = cast(Callable[[str], Any], field_type)(varval)
-                            break
-                        elif field_type == list[typ] or field_type == List[typ]:
-                            v = list(map(lambda x: typ(x.strip()), varval.split(",")))
-                            break
-
-                if v is None:
-                    raise RuntimeError(
-                        f"Unsupported type {field_type} for field {field}"
-                    )
-
-            setattr(cls, field, v)
+        environ, group = source
+        _refresh_instance(self, group.plan, environ)
 
     @classmethod
-    def refresh(cls) -> None:
+    def load(cls: Type[_E], environ: Mapping[str, str]) -> _E:
         """
-        Refresh the environment-config object.
+        Load an instance of this config from a mapping of environment variable
+        names to raw values, instead of binding values to the class itself.
+        """
+        return cls.__yapeco_plan__.load_instance(cls, environ)
+
+    @classmethod
+    def load_many(cls: Type[_E], environs: Iterable[Mapping[str, str]]) -> Iterator[_E]:
         """
-        cls.__init_subclass__()
+        Lazily load one instance per mapping in `environs` (see `load()`).
+        """
+        load_instance = cls.__yapeco_plan__.load_instance
+        for environ in environs:
+            yield load_instance(cls, environ)
+
+    @_HybridMethod
+    def snapshot(self_or_cls) -> "Snapshot":  # noqa: N805
+        """
+        Take an immutable, hashable and picklable snapshot of the current
+        values of this config class (or instance), see `yapeco.snapshot`.
+        """
+        from yapeco.snapshot import take_snapshot
+
+        return take_snapshot(self_or_cls)
+
+    @classmethod
+    def load_columns(cls, environs: Iterable[Mapping[str, str]]) -> "Columns":
+        """
+        Load many mappings at once into column-oriented storage, collecting
+        per-row errors instead of raising (see `yapeco.columns`). Nested
+        groups are not included.
+        """
+        from yapeco.columns import load_columns
+
+        plan = cls.__yapeco_plan__
+        return load_columns(plan.fields, environs, plan.maps)
+
+
+# long-lived, so that sources keeping per-thread state (such as the
+# connections of `SqliteLayer`) keep it between refreshes
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_threads = 0
+_executor_lock = Lock()
+
+
+def _source_executor(threads: int) -> ThreadPoolExecutor:
+    """The executor refreshing sources, replaced if `threads` changes."""
+    global _executor, _executor_threads
+    with _executor_lock:
+        if _executor is None or _executor_threads != threads:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(threads, thread_name_prefix="yapeco")
+            _executor_threads = threads
+        return _executor
+
+
+@after_fork_in_child
+def _reset_source_executor() -> None:
+    # its threads did not survive fork(); a new one is created when needed
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = Lock()
+
+
+def _refresh_classes(
+    classes: Iterable[type],
+    environ: Mapping[str, str],
+    threads: Optional[int] = None,
+) -> Dict[type, Exception]:
+    """
+    Refresh `classes` from one snapshot: `environ`, or for classes with a
+    source, one refresh of that source (fanned out on `threads` threads if
+    given, for sources doing I/O). Returns the errors of the classes that
+    failed to refresh.
+    """
+    classes = list(classes)
+    sources = {}
+    for cls in classes:
+        source = cls.__yapeco_env_source__
+        if source is not None and hasattr(source, "refresh"):
+            sources[id(source)] = source
+
+    def sync(source: Any) -> Optional[Exception]:
+        try:
+            source.refresh()
+        except Exception as e:
+            return e
+        return None
+
+    if threads and len(sources) > 1:
+        pool = _source_executor(threads)
+        failed = dict(zip(sources, pool.map(sync, sources.values())))
+    else:
+        failed = {key: sync(source) for key, source in sources.items()}
+
+    errors: Dict[type, Exception] = {}
+    # values parsed in this pass, per source (mappings may differ in values)
+    shared: Dict[int, Dict[Any, Any]] = {}
+    indexes: Dict[int, PrefixIndex] = {}
+    for cls in classes:
+        source = cls.__yapeco_env_source__
+        error = failed.get(id(source))
+        if error is not None:
+            errors[cls] = error
+            continue
+        try:
+            mapping = environ if source is None else source
+            index = indexes.get(id(source))
+            if index is None:
+                index = indexes[id(source)] = PrefixIndex(mapping)
+            _refresh_class(cls, mapping, shared.setdefault(id(source), {}), index)
+        except Exception as e:
+            errors[cls] = e
+    return errors
+
+
+def refresh_all(threads: Optional[int] = None) -> Dict[type, Exception]:
+    """
+    Refresh every live config class (except those created with
+    `autoload=False`) from one snapshot of `os.environ` and of each source.
+    Values shared between classes are parsed once per variable and type
+    (mutable ones are copied).
+    Pass `threads` to refresh sources (e.g. files or databases) on a thread
+    pool. Errors don't stop other classes from being refreshed; returns the
+    error of each class that failed.
+    """
+    with _config_classes_lock:
+        items = list(_config_classes.items())
+    classes = [cls for cls, autoload in items if autoload]
+    return _refresh_classes(classes, dict(os_environ), threads)
+
+
+class SighupRefresher:
+    """
+    Refreshes config classes on a background thread when `SIGHUP` is received
+    (see `install_sighup_refresh()`). The signal handler only sets a flag, so
+    signals received while a refresh runs are coalesced into one more refresh.
+    """
+
+    def __init__(self) -> None:
+        self.classes: List[type] = []
+        # `.env` file read, over `os.environ`, by classes without a source
+        self.env_file: Optional[str] = None
+        # the source given to those classes for `env_file`
+        self.source: Optional[Mapping[str, str]] = None
+        self.on_error: Optional[Callable[[BaseException], None]] = None
+        # number of completed refreshes of all classes
+        self.passes = 0
+        self._event = Event()
+        self._thread: Optional[Thread] = None
+
+    def _handle(self, signum: int, frame: Any) -> None:
+        # nothing else: starting a thread here could deadlock
+        self._event.set()
+
+    def trigger(self) -> None:
+        """
+        Request a refresh, as if `SIGHUP` was received, (re)starting the
+        background thread if needed (e.g. in a forked child).
+        """
+        self._event.set()
+        self.start()
+
+    def start(self) -> None:
+        """Start the background thread, unless it is running already."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = Thread(
+                target=self._run, name="yapeco-sighup-refresh", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._event.wait()
+            self._event.clear()
+            self.refresh()
+
+    def _error(self, e: BaseException) -> None:
+        if self.on_error is not None:
+            self.on_error(e)
+        else:
+            sys.excepthook(type(e), e, e.__traceback__)
+
+    def use_env_file(self, env_file: str) -> None:
+        """
+        Make the registered classes without a source of their own read
+        `env_file` over `os.environ`, through a `LayeredSource`, so that
+        every refresh (not only those on `SIGHUP`) sees the file's values.
+        """
+        from yapeco.sources import EnvFileLayer, EnvironLayer, LayeredSource
+
+        old = self.source
+        if env_file != self.env_file or old is None:
+            self.env_file = env_file
+            self.source = LayeredSource(EnvironLayer(), EnvFileLayer(env_file))
+        for cls in self.classes:
+            source = cls.__yapeco_env_source__
+            if source is None or source is old:
+                cls.__yapeco_env_source__ = self.source
+
+    def refresh(self) -> None:
+        """Refresh all registered classes from one snapshot of the environment."""
+        for e in _refresh_classes(self.classes, dict(os_environ)).values():
+            # counted in the class's refresh metrics; others were refreshed
+            self._error(e)
+        self.passes += 1
+
+
+_sighup_refresher: Optional[SighupRefresher] = None
+
+
+def install_sighup_refresh(
+    *classes: type,
+    env_file: Optional[str] = None,
+    on_error: Optional[Callable[[BaseException], None]] = None,
+) -> SighupRefresher:
+    """
+    Refresh `classes` on a background thread whenever the process receives
+    `SIGHUP`, e.g. after editing `env_file` (whose values then override
+    `os.environ` for the classes without a source of their own, see
+    `SighupRefresher.use_env_file()`). Must be called from the main thread;
+    calling it again adds more classes to the same refresher, and in a forked
+    child restarts its thread. Refresh errors are passed to `on_error` (by
+    default, printed like uncaught exceptions).
+    """
+    global _sighup_refresher
+    refresher = _sighup_refresher
+    if refresher is None:
+        refresher = SighupRefresher()
+    for cls in classes:
+        if cls not in refresher.classes:
+            refresher.classes.append(cls)
+    if env_file is not None or refresher.env_file is not None:
+        refresher.use_env_file(env_file or refresher.env_file)  # type: ignore[arg-type]
+    if on_error is not None:
+        refresher.on_error = on_error
+    signal.signal(signal.SIGHUP, refresher._handle)
+    _sighup_refresher = refresher
+    refresher.start()
+    return refresher
+
+
+@after_fork_in_child
+def _reset_sighup_refresher() -> None:
+    # the refresher thread does not survive fork(), but the signal handler
+    # does: signals set the flag until `trigger()` or `install_sighup_refresh()`
+    # restarts the thread in the child
+    refresher = _sighup_refresher
+    if refresher is not None:
+        pending = refresher._event.is_set()
+        refresher._event = Event()
+        if pending:
+            refresher._event.set()
+        refresher._thread = None
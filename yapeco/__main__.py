@@ -0,0 +1,5 @@
+import sys
+
+from yapeco.cli import main
+
+sys.exit(main())
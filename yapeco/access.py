@@ -0,0 +1,161 @@
+"""
+Field access counters, to find config fields that are never read (and could
+be made lazy, or removed) and hot ones.
+
+Create config classes with `track_access=True` (or set `YAPECO_TRACK_ACCESS=1`
+before they are created), run the application for a while, then:
+
+    from yapeco.access import access_report, write_access_report
+
+    report = access_report()  # all tracked classes
+    report["lazy_candidates"]  # never-read fields, costliest to parse first
+    report["lazy_candidates"][0]["lazy_type"]  # e.g. "LazySequence[int]"
+
+Each read through the class costs one descriptor call and a counter
+increment; `measure_overhead()` measures it on this interpreter. Snapshots
+and computed fields read through the class too, so they count as reads.
+"""
+
+import json
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional
+
+from yapeco import (
+    BaseEnvironment,
+    JsonObject,
+    TrackedValue,
+    _get_origin_and_args,
+    config_classes,
+)
+
+
+def access_counts(cls) -> Dict[str, int]:
+    """Reads of each field declared on `cls` since it was created or reset."""
+    counts = {}
+    plan = cls.__dict__["__yapeco_own__"]
+    for member in plan.fields + plan.maps:
+        cell = cls.__dict__.get(member.name)
+        if isinstance(cell, TrackedValue):
+            counts[member.name] = cell.reads
+    return counts
+
+
+def reset_access_counts(*classes: type) -> None:
+    """Reset the counters of `classes` (default: every tracked class)."""
+    for cls in classes or config_classes():
+        for cell in cls.__dict__.values():
+            if isinstance(cell, TrackedValue):
+                cell.reads = 0
+
+
+def _parse_ns(field: Any, raw: Optional[str], iterations: int = 10) -> int:
+    # unset and blank values aren't parsed
+    parse = field.type.parse
+    if not raw or parse is None:
+        return 0
+    start = perf_counter_ns()
+    try:
+        for _ in range(iterations):
+            parse(raw)
+    except Exception:
+        pass
+    return (perf_counter_ns() - start) // iterations
+
+
+def _lazy_type(field: Any) -> Optional[str]:
+    # the annotation that would parse the field on first use instead
+    base = field.type.base
+    if base is JsonObject:
+        return "LazyJsonObject"
+    origin, args = _get_origin_and_args(base)
+    if origin is list and len(args) == 1:
+        return f"LazySequence[{args[0].__name__}]"
+    return None
+
+
+def access_report(*classes: type, hot: int = 10) -> Dict[str, Any]:
+    """
+    Report field reads of `classes` (default: every tracked class): per-field
+    read counts and parse times, the never-read fields, the `hot` most read
+    ones, and `lazy_candidates`: never-read fields sorted by parse time, the
+    ones worth loading lazily (or removing) first. Each field's `lazy_type`
+    is the annotation that would defer its parsing to first use, if there is
+    one (`LazySequence[T]` for `List[T]`, `LazyJsonObject` for JSON).
+    """
+    if not classes:
+        classes = tuple(c for c in config_classes() if c.__yapeco_track_access__)
+    fields: List[Dict[str, Any]] = []
+    for cls in classes:
+        counts = access_counts(cls)
+        plan = cls.__dict__["__yapeco_own__"]
+        raws = cls.__dict__.get("__yapeco_raw__") or ()
+        for i, field in enumerate(plan.fields):
+            if field.name not in counts:
+                continue
+            raw = raws[i] if i < len(raws) else None
+            fields.append(
+                {
+                    "class": f"{cls.__module__}.{cls.__qualname__}",
+                    "field": field.name,
+                    "varname": field.varname,
+                    "reads": counts[field.name],
+                    "parse_ns": _parse_ns(field, raw),
+                    "lazy_type": _lazy_type(field),
+                }
+            )
+        for map_field in plan.maps:
+            if map_field.name in counts:
+                fields.append(
+                    {
+                        "class": f"{cls.__module__}.{cls.__qualname__}",
+                        "field": map_field.name,
+                        "varname": f"{map_field.prefix}*",
+                        "reads": counts[map_field.name],
+                        "parse_ns": None,
+                        "lazy_type": None,
+                    }
+                )
+
+    never_read = [f for f in fields if f["reads"] == 0]
+    read = sorted((f for f in fields if f["reads"]), key=lambda f: -f["reads"])
+    return {
+        "fields": fields,
+        "never_read": never_read,
+        "hot": read[:hot],
+        "lazy_candidates": sorted(never_read, key=lambda f: -(f["parse_ns"] or 0)),
+    }
+
+
+def write_access_report(path: str, *classes: type, hot: int = 10) -> None:
+    """Write `access_report()` to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(access_report(*classes, hot=hot), f, indent=2)
+        f.write("\n")
+
+
+def measure_overhead(iterations: int = 100_000) -> Dict[str, float]:
+    """
+    Time reading a field through an untracked and a tracked class, in
+    nanoseconds per read.
+    """
+
+    class Untracked(BaseEnvironment, autoload=False, track_access=False):
+        pass
+
+    class Tracked(BaseEnvironment, autoload=False, track_access=True):
+        pass
+
+    Untracked.value = 1  # type: ignore[attr-defined]
+    Tracked.value = TrackedValue(1)  # type: ignore[attr-defined]
+    result = {}
+    for name, cls in (("untracked_ns", Untracked), ("tracked_ns", Tracked)):
+        best = None
+        for _ in range(5):
+            start = perf_counter_ns()
+            for _ in range(iterations):
+                cls.value
+            elapsed = (perf_counter_ns() - start) / iterations
+            best = elapsed if best is None else min(best, elapsed)
+        result[name] = best
+    result["overhead_ns"] = result["tracked_ns"] - result["untracked_ns"]
+    return result
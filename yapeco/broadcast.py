@@ -0,0 +1,441 @@
+"""
+Host-local config broadcast: one coordinator process refreshes (reading and
+parsing the environment and sources once) and sends the changed values of
+its config classes over a Unix domain socket to many worker processes, which
+apply them without parsing, all at the same generation:
+
+    # coordinator
+    coordinator = Coordinator("/run/app/config.sock", Config, FeatureFlags)
+    coordinator.start(interval=5.0)  # refresh every 5s, broadcast changes
+
+    # each worker
+    Worker("/run/app/config.sock", Config, FeatureFlags).start()
+
+Messages are length-prefixed pickles of `(kind, generation, values)`, with
+`values` mapping `module:Class` to `{field: value}` for the fields and map
+fields declared on each class (nested groups aren't broadcast). A `"full"`
+message carries every value, a `"delta"` only those changed since the
+previous generation. A worker receiving a delta that doesn't follow its
+generation asks for a full snapshot with a fixed (empty) frame, the only
+thing workers ever send. Coordinators never block on a worker: each has a
+send buffer, and workers that fall more than `max_buffer` bytes behind are
+dropped. Workers reconnect (and so resynchronise) after losing the
+connection. In a child process forked from one running a worker (e.g. a
+preloading prefork server), the worker reconnects on its own; a forked
+coordinator is stopped in the child.
+
+Workers unpickle what the coordinator sends, so the socket is created with
+mode `0o600`, and where the platform reports peer credentials
+(`SO_PEERCRED`), both ends only talk to processes running as one of `uids`
+(default: the current user).
+"""
+
+import os
+import pickle
+import selectors
+import socket
+import struct
+import threading
+from time import monotonic
+from typing import Any, Collection, Dict, Optional, Tuple
+from weakref import WeakSet
+
+from yapeco import _publish, _refresh_classes, _untracked, after_fork_in_child
+
+_header = struct.Struct(">I")
+_ucred = struct.Struct("3i")
+
+# the frame workers send to ask for a full snapshot
+_resync = _header.pack(0)
+
+Values = Dict[str, Dict[str, Any]]
+
+
+def _class_key(cls) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _encode(kind: str, generation: int, values: Values) -> bytes:
+    payload = pickle.dumps((kind, generation, values), pickle.HIGHEST_PROTOCOL)
+    return _header.pack(len(payload)) + payload
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_message(sock: socket.socket) -> Optional[Tuple[str, int, Values]]:
+    header = _recv_exactly(sock, _header.size)
+    if header is None:
+        return None
+    payload = _recv_exactly(sock, _header.unpack(header)[0])
+    if payload is None:
+        return None
+    return pickle.loads(payload)
+
+
+def _check_peer(sock: socket.socket, uids: Collection[int]) -> None:
+    # without peer credentials, only the socket's file mode protects it
+    option = getattr(socket, "SO_PEERCRED", None)
+    if option is None:
+        return
+    _, uid, _ = _ucred.unpack(sock.getsockopt(socket.SOL_SOCKET, option, _ucred.size))
+    if uid not in uids:
+        raise PermissionError(f"Peer of {sock.getsockname()!r} runs as uid {uid}")
+
+
+def _own_values(cls) -> Dict[str, Any]:
+    plan = cls.__dict__["__yapeco_own__"]
+    state = cls.__dict__
+    with state["__yapeco_lock__"]:
+        return {m.name: _untracked(state.get(m.name)) for m in plan.fields + plan.maps}
+
+
+class Coordinator:
+    """
+    Refreshes `classes` and broadcasts their changes to workers connected to
+    the Unix domain socket at `path`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *classes: type,
+        mode: int = 0o600,
+        uids: Optional[Collection[int]] = None,
+        max_buffer: int = 1 << 20,
+    ) -> None:
+        self.path = path
+        self.classes = {_class_key(cls): cls for cls in classes}
+        self.mode = mode
+        self.uids = (os.getuid(),) if uids is None else uids
+        self.max_buffer = max_buffer
+        self.generation = 0
+        self._values: Values = {}
+        self._lock = threading.Lock()
+        # unsent output and partially received input of each worker
+        self._clients: Dict[socket.socket, Tuple[bytearray, bytearray]] = {}
+        self._selector = selectors.DefaultSelector()
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        _coordinators.add(self)
+
+    def _after_fork(self) -> None:
+        # the child doesn't serve: the parent still owns the socket and its
+        # workers, so close the inherited descriptors without unlinking
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        for client in self._clients:
+            client.close()
+        self._clients = {}
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        self._selector = selectors.DefaultSelector()
+
+    def listen(self) -> None:
+        """Bind the socket (replacing a stale one) and take initial values."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        # before listening: nothing can connect yet
+        os.chmod(self.path, self.mode)
+        server.listen()
+        server.setblocking(False)
+        self._selector.register(server, selectors.EVENT_READ)
+        self._server = server
+        with self._lock:
+            self._values = {key: _own_values(cls) for key, cls in self.classes.items()}
+            self.generation += 1
+
+    def refresh(self) -> Dict[type, Exception]:
+        """
+        Refresh all classes from one snapshot of the environment, then
+        broadcast what changed. Returns the errors of classes that failed.
+        """
+        errors = _refresh_classes(self.classes.values(), dict(os.environ))
+        self.publish()
+        return errors
+
+    def publish(self) -> int:
+        """
+        Broadcast values changed since the last broadcast as a new generation
+        (if anything changed). Returns the current generation.
+        """
+        with self._lock:
+            delta: Values = {}
+            for key, cls in self.classes.items():
+                old = self._values.get(key, {})
+                new = _own_values(cls)
+                changed = {
+                    name: v
+                    for name, v in new.items()
+                    if name not in old or (v is not old[name] and v != old[name])
+                }
+                if changed:
+                    delta[key] = changed
+                    self._values[key] = new
+            if not delta:
+                return self.generation
+            self.generation += 1
+            message = _encode("delta", self.generation, delta)
+            for client in list(self._clients):
+                self._send(client, message)
+            return self.generation
+
+    def _send(self, client: socket.socket, message: bytes) -> None:
+        output = self._clients[client][0]
+        if len(output) + len(message) > self.max_buffer:
+            # not reading fast enough: it resynchronises on reconnect
+            self._drop(client)
+            return
+        output += message
+        self._flush(client)
+
+    def _flush(self, client: socket.socket) -> None:
+        output = self._clients[client][0]
+        try:
+            sent = client.send(output)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(client)
+            return
+        del output[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if output else 0)
+        self._selector.modify(client, events)
+
+    def _drop(self, client: socket.socket) -> None:
+        if self._clients.pop(client, None) is not None:
+            self._selector.unregister(client)
+        client.close()
+
+    def _full(self, client: socket.socket) -> None:
+        self._send(client, _encode("full", self.generation, self._values))
+
+    def _accept(self) -> None:
+        assert self._server is not None
+        try:
+            client, _ = self._server.accept()
+        except BlockingIOError:
+            return
+        try:
+            _check_peer(client, self.uids)
+        except OSError:
+            client.close()
+            return
+        client.setblocking(False)
+        with self._lock:
+            self._clients[client] = (bytearray(), bytearray())
+            self._selector.register(client, selectors.EVENT_READ)
+            self._full(client)
+
+    def _handle(self, client: socket.socket, events: int) -> None:
+        with self._lock:
+            if client not in self._clients:
+                return
+            if events & selectors.EVENT_WRITE:
+                self._flush(client)
+                if client not in self._clients:
+                    return
+            if not events & selectors.EVENT_READ:
+                return
+            try:
+                data = client.recv(4096)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b""
+            if not data:
+                self._drop(client)
+                return
+            received = self._clients[client][1]
+            received += data
+            while len(received) >= len(_resync):
+                if received[: len(_resync)] != _resync:
+                    # workers send nothing else
+                    self._drop(client)
+                    return
+                del received[: len(_resync)]
+                self._full(client)
+                if client not in self._clients:
+                    return
+
+    def serve(self, interval: Optional[float] = None) -> None:
+        """
+        Serve workers until `stop()`, refreshing and broadcasting every
+        `interval` seconds if given.
+        """
+        if self._server is None:
+            self.listen()
+        next_refresh = None if interval is None else monotonic() + interval
+        while not self._stop.is_set():
+            timeout = 0.5 if next_refresh is None else next_refresh - monotonic()
+            for key, events in self._selector.select(timeout=max(timeout, 0)):
+                if key.fileobj is self._server:
+                    self._accept()
+                else:
+                    self._handle(key.fileobj, events)  # type: ignore[arg-type]
+            if next_refresh is not None and monotonic() >= next_refresh:
+                self.refresh()
+                next_refresh = monotonic() + interval  # type: ignore[operator]
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Listen, then `serve()` on a background thread."""
+        self.listen()
+        self._thread = threading.Thread(
+            target=self.serve, args=(interval,), name="yapeco-coordinator", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving, disconnect workers and remove the socket."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            for client in list(self._clients):
+                self._drop(client)
+        if self._server is not None:
+            self._selector.unregister(self._server)
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+class Worker:
+    """
+    Applies values broadcast by a `Coordinator` at `path` to `classes`,
+    which should be created with `autoload=False` (or are simply overwritten
+    on the first message).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *classes: type,
+        reconnect_interval: float = 0.5,
+        uids: Optional[Collection[int]] = None,
+    ) -> None:
+        self.path = path
+        self.classes = {_class_key(cls): cls for cls in classes}
+        self.reconnect_interval = reconnect_interval
+        self.uids = (os.getuid(),) if uids is None else uids
+        # generation of the last applied message, 0 until synchronised
+        self.generation = 0
+        self.resyncs = 0
+        self._stop = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        _workers.add(self)
+
+    def _after_fork(self) -> None:
+        # the connection is shared with the parent: drop it, and reconnect
+        # (getting a full snapshot) if the worker was running
+        running = self._thread is not None and not self._stop.is_set()
+        sock = self._sock
+        if sock is not None:
+            sock.close()
+        self._sock = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.generation = 0
+        if running:
+            self.start()
+
+    def apply(self, kind: str, generation: int, values: Values) -> bool:
+        """
+        Apply a broadcast message. Returns `False` (applying nothing) for a
+        delta that doesn't follow the current generation.
+        """
+        if kind == "delta" and generation != self.generation + 1:
+            return False
+        for key, class_values in values.items():
+            cls = self.classes.get(key)
+            if cls is None:
+                continue
+            with cls.__dict__["__yapeco_lock__"]:
+                # not parsed from a local raw value; a local refresh reparses
+                _publish(cls, class_values, None)
+        self.generation = generation
+        return True
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+            _check_peer(sock, self.uids)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def run(self) -> None:
+        """Receive and apply messages until `stop()`, reconnecting as needed."""
+        while not self._stop.is_set():
+            try:
+                self._sock = sock = self._connect()
+            except OSError:
+                self._stop.wait(self.reconnect_interval)
+                continue
+            try:
+                self._receive(sock)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            finally:
+                sock.close()
+                self._sock = None
+
+    def _receive(self, sock: socket.socket) -> None:
+        resyncing = False
+        while not self._stop.is_set():
+            message = _recv_message(sock)
+            if message is None:
+                return
+            if resyncing and message[0] == "delta":
+                # superseded by the full snapshot asked for
+                continue
+            resyncing = not self.apply(*message)
+            if resyncing:
+                self.resyncs += 1
+                sock.sendall(_resync)
+
+    def start(self) -> None:
+        """`run()` on a background thread."""
+        self._thread = threading.Thread(
+            target=self.run, name="yapeco-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+
+
+_coordinators: "WeakSet[Coordinator]" = WeakSet()
+_workers: "WeakSet[Worker]" = WeakSet()
+
+
+@after_fork_in_child
+def _reset_broadcast() -> None:
+    for coordinator in list(_coordinators):
+        coordinator._after_fork()
+    for worker in list(_workers):
+        worker._after_fork()
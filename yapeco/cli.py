@@ -0,0 +1,347 @@
+"""
+Command-line tools, run as `python -m yapeco <command>`.
+
+    python -m yapeco profile package.module:Config [--env-file .env] [--json]
+    python -m yapeco schema package.module:Config [-o schema.json]
+    python -m yapeco validate schema.json [ENV_FILE ...] [-j PROCESSES] [--json]
+    python -m yapeco contention package.module:Config [-r READERS] [-d SECONDS]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Tuple
+
+from yapeco import Group
+from yapeco.envfile import read_env_file
+
+
+def import_class(path: str) -> Tuple[Any, int]:
+    """
+    Import `package.module:Class` (the class part may be dotted), returning
+    the class and the time in nanoseconds taken to import its module.
+    """
+    module_name, sep, qualname = path.partition(":")
+    if not sep or not qualname:
+        raise ValueError(f"Expected `package.module:Class`, got `{path}`")
+    start = perf_counter_ns()
+    obj: Any = importlib.import_module(module_name)
+    import_ns = perf_counter_ns() - start
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj, import_ns
+
+
+def _type_name(annotation: Any) -> str:
+    if isinstance(annotation, type):
+        return annotation.__qualname__
+    return str(annotation).replace("typing.", "")
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def _forget_raws(namespace: Any, plan: Any) -> None:
+    # forget the raw values of a class and its loaded groups, so that the
+    # next refresh re-parses and re-publishes everything
+    namespace.__yapeco_raw__ = None
+    for group in plan.groups:
+        value = namespace.__dict__.get(group.name)
+        if value is not None and not isinstance(value, Group):
+            _forget_raws(value, group.plan)
+
+
+def _percentile(sorted_values: List[int], p: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def profile_class(cls, iterations: int = 100, top: int = 5) -> Dict[str, Any]:
+    """
+    Time per-field parsing and full (nothing skipped) `refresh()` of a config
+    class.
+    """
+    if iterations < 1:
+        raise ValueError(f"iterations must be at least 1, got {iterations}")
+    environ = os.environ
+    fields = []
+    for field in cls.__yapeco_plan__.fields:
+        raw = environ.get(field.varname)
+        error = None
+        elapsed = 0
+        try:
+            field.load(raw)
+            parse = field.type.parse
+            if raw and parse is not None:
+                start = perf_counter_ns()
+                for _ in range(iterations):
+                    parse(raw)
+                elapsed = perf_counter_ns() - start
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        fields.append(
+            {
+                "field": field.name,
+                "varname": field.varname,
+                "type": _type_name(field.type.annotation),
+                "raw_size": None if raw is None else len(raw),
+                "parse_ns": elapsed // iterations,
+                "error": error,
+            }
+        )
+
+    largest = sorted(
+        (f for f in fields if f["raw_size"]), key=lambda f: -f["raw_size"]
+    )[:top]
+
+    refresh_ns = []
+    refresh_error = None
+    for _ in range(iterations):
+        with cls.__yapeco_lock__:
+            _forget_raws(cls, cls.__yapeco_plan__)
+            start = perf_counter_ns()
+            try:
+                cls.refresh()
+            except Exception as e:
+                refresh_error = f"{type(e).__name__}: {e}"
+                break
+            refresh_ns.append(perf_counter_ns() - start)
+    refresh_ns.sort()
+    refresh: Dict[str, Any] = {"iterations": len(refresh_ns), "error": refresh_error}
+    if refresh_ns:
+        refresh.update(
+            min_ns=refresh_ns[0],
+            mean_ns=sum(refresh_ns) // len(refresh_ns),
+            p50_ns=_percentile(refresh_ns, 0.5),
+            p99_ns=_percentile(refresh_ns, 0.99),
+            max_ns=refresh_ns[-1],
+        )
+
+    return {
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "fields": sorted(fields, key=lambda f: -f["parse_ns"]),
+        "largest_values": [
+            {"varname": f["varname"], "raw_size": f["raw_size"]} for f in largest
+        ],
+        "refresh": refresh,
+    }
+
+
+def contention_benchmark(
+    cls, readers: int = 4, duration: float = 1.0
+) -> Dict[str, Any]:
+    """
+    Measure the latency of reading the fields of a config class on `readers`
+    threads while another thread keeps refreshing it (forcing every refresh
+    to re-parse and re-publish all values).
+    """
+    names = [field.name for field in cls.__yapeco_plan__.fields]
+    stop = threading.Event()
+    samples: List[List[int]] = [[] for _ in range(readers)]
+    refreshes = 0
+
+    def refresh() -> None:
+        nonlocal refreshes
+        while not stop.is_set():
+            with cls.__yapeco_lock__:
+                # forget the raw values, so that nothing is skipped
+                cls.__yapeco_raw__ = None
+                cls.refresh()
+            refreshes += 1
+
+    def read(out: List[int]) -> None:
+        while not stop.is_set():
+            for name in names:
+                start = perf_counter_ns()
+                getattr(cls, name)
+                out.append(perf_counter_ns() - start)
+
+    threads = [threading.Thread(target=read, args=(out,)) for out in samples]
+    threads.append(threading.Thread(target=refresh))
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    read_ns = sorted(ns for out in samples for ns in out)
+    report: Dict[str, Any] = {
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "readers": readers,
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "refreshes": refreshes,
+        "reads": len(read_ns),
+    }
+    if read_ns:
+        report.update(
+            p50_ns=_percentile(read_ns, 0.5),
+            p99_ns=_percentile(read_ns, 0.99),
+            max_ns=read_ns[-1],
+        )
+    return report
+
+
+def _format_us(ns: int) -> str:
+    return f"{ns / 1000:.1f}us"
+
+
+def _print_profile(report: Dict[str, Any]) -> None:
+    print(f"{report['class']}")
+    print(f"  module import: {_format_us(report['import_ns'])}")
+    refresh = report["refresh"]
+    if refresh["iterations"]:
+        print(
+            f"  refresh ({refresh['iterations']}x): "
+            f"mean {_format_us(refresh['mean_ns'])}, "
+            f"p50 {_format_us(refresh['p50_ns'])}, "
+            f"p99 {_format_us(refresh['p99_ns'])}, "
+            f"max {_format_us(refresh['max_ns'])}"
+        )
+    if refresh["error"]:
+        print(f"  refresh failed: {refresh['error']}")
+    print("  fields (slowest first):")
+    for f in report["fields"]:
+        line = f"    {f['field']:<32} {_format_us(f['parse_ns']):>10}  {f['type']}"
+        if f["error"]:
+            line += f"  [{f['error']}]"
+        print(line)
+    if report["largest_values"]:
+        print("  largest raw values:")
+        for f in report["largest_values"]:
+            print(f"    {f['varname']:<32} {f['raw_size']:>10} chars")
+
+
+def _profile(args: argparse.Namespace) -> int:
+    if args.env_file:
+        os.environ.update(read_env_file(args.env_file))
+    cls, import_ns = import_class(args.target)
+    report = profile_class(cls, iterations=args.iterations, top=args.top)
+    report["import_ns"] = import_ns
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        _print_profile(report)
+    return 1 if report["refresh"]["error"] else 0
+
+
+def _contention(args: argparse.Namespace) -> int:
+    if args.env_file:
+        os.environ.update(read_env_file(args.env_file))
+    cls, _ = import_class(args.target)
+    report = contention_benchmark(cls, args.readers, args.duration)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return 0
+    print(report["class"])
+    print(
+        f"  {report['readers']} readers, GIL "
+        f"{'enabled' if report['gil_enabled'] else 'disabled'}: "
+        f"{report['reads']} reads during {report['refreshes']} refreshes"
+    )
+    if report["reads"]:
+        print(
+            f"  read p50 {report['p50_ns']}ns, p99 {report['p99_ns']}ns, "
+            f"max {_format_us(report['max_ns'])}"
+        )
+    return 0
+
+
+def _schema(args: argparse.Namespace) -> int:
+    from yapeco.schema import export_schema, write_schema
+
+    cls, _ = import_class(args.target)
+    if args.output:
+        write_schema(cls, args.output)
+    else:
+        json.dump(export_schema(cls), sys.stdout, indent=2)
+        print()
+    return 0
+
+
+def _validate(args: argparse.Namespace) -> int:
+    from yapeco.schema import read_schema, validate_environ, validate_files
+
+    schema = read_schema(args.schema)
+    if args.files:
+        results = validate_files(schema, args.files, processes=args.processes)
+    else:
+        results = {"<environ>": validate_environ(schema, os.environ)}
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        for path, errors in results.items():
+            print(f"{path}: {'FAILED' if errors else 'ok'}")
+            for error in errors:
+                print(f"  {error}")
+    return 1 if any(results.values()) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m yapeco")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    profile = commands.add_parser(
+        "profile", help="time module import, field parsing and refresh of a class"
+    )
+    profile.add_argument("target", help="config class as `package.module:Class`")
+    profile.add_argument(
+        "--env-file", help="load variables from this .env file (over os.environ)"
+    )
+    profile.add_argument("-n", "--iterations", type=_positive_int, default=100)
+    profile.add_argument(
+        "--top", type=int, default=5, help="number of largest values to list"
+    )
+    profile.add_argument("--json", action="store_true", help="output JSON")
+    profile.set_defaults(func=_profile)
+
+    schema = commands.add_parser("schema", help="export the field schema of a class")
+    schema.add_argument("target", help="config class as `package.module:Class`")
+    schema.add_argument("-o", "--output", help="write to this file (default: stdout)")
+    schema.set_defaults(func=_schema)
+
+    validate = commands.add_parser(
+        "validate", help="validate environments against a schema, without the app"
+    )
+    validate.add_argument("schema", help="schema file written by `schema`")
+    validate.add_argument(
+        "files",
+        nargs="*",
+        help=".env, JSON or NUL-separated environment dumps (default: os.environ)",
+    )
+    validate.add_argument(
+        "-j", "--processes", type=int, help="worker processes (default: CPU count)"
+    )
+    validate.add_argument("--json", action="store_true", help="output JSON")
+    validate.set_defaults(func=_validate)
+
+    contention = commands.add_parser(
+        "contention",
+        help="measure field read latency on reader threads during refreshes",
+    )
+    contention.add_argument("target", help="config class as `package.module:Class`")
+    contention.add_argument(
+        "--env-file", help="load variables from this .env file (over os.environ)"
+    )
+    contention.add_argument("-r", "--readers", type=int, default=4)
+    contention.add_argument(
+        "-d", "--duration", type=float, default=1.0, help="seconds to run"
+    )
+    contention.add_argument("--json", action="store_true", help="output JSON")
+    contention.set_defaults(func=_contention)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,198 @@
+"""
+Column-oriented bulk loading of many environments.
+
+Each field is parsed across all rows in one loop and stored compactly:
+`array.array` for bool/int/float fields, interned strings, and member indexes
+for enums; map fields are columns of dicts. Rows that fail to parse are
+reported in `Columns.errors`; their slots in every failed column are marked
+missing.
+"""
+
+import sys
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from yapeco import Field, MapField, PrefixIndex, is_enum_type
+
+
+class RowError(NamedTuple):
+    """A field that failed to load for one row."""
+
+    row: int
+    field: str
+    error: Exception
+
+
+class Column:
+    """
+    Values of one field across all rows.
+
+    `values` is an `array.array` for bool/int/float fields, an `array("i")`
+    of member indexes into `members` for enum fields, and a list otherwise
+    (of dicts for map fields). `present` holds 1 for each row that has a value and 0
+    for missing or failed rows.
+    """
+
+    __slots__ = ("field", "values", "present", "members")
+
+    def __init__(
+        self,
+        field: Union[Field, MapField],
+        values: Any,
+        present: bytearray,
+        members=None,
+    ):
+        self.field = field
+        self.values = values
+        self.present = present
+        self.members = members
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def __getitem__(self, row: int) -> Any:
+        if not self.present[row]:
+            return None
+        v = self.values[row]
+        if self.members is not None:
+            return self.members[v]
+        if isinstance(self.values, array) and self.values.typecode == "b":
+            return bool(v)
+        return v
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(len(self.present)):
+            yield self[row]
+
+    def __repr__(self) -> str:
+        return f"Column({self.field.name!r}, rows={len(self)})"
+
+
+class Columns:
+    """Result of `BaseEnvironment.load_columns()`."""
+
+    __slots__ = ("columns", "errors", "rows")
+
+    def __init__(self, columns: Dict[str, Column], errors: List[RowError], rows: int):
+        self.columns = columns
+        self.errors = errors
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def failed_rows(self) -> List[int]:
+        """Indexes of rows with at least one error, in order."""
+        return sorted({e.row for e in self.errors})
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Values of one row as a dict."""
+        return {name: column[index] for name, column in self.columns.items()}
+
+
+_array_typecodes = {bool: "b", int: "q", float: "d"}
+
+
+def _load_column(
+    field: Field, raws: List[Any], errors: List[RowError]
+) -> Tuple[Any, bytearray, Any]:
+    base = field.type.base
+    load = field.load
+    present = bytearray(len(raws))
+    members = None
+    index = None
+
+    if is_enum_type(base):
+        members = tuple(base)
+        index = {member: i for i, member in enumerate(members)}
+        typecode = "i"
+    else:
+        typecode = _array_typecodes.get(base)
+    if typecode is not None:
+        values: Any = array(typecode, bytes(array(typecode).itemsize * len(raws)))
+    else:
+        values = [None] * len(raws)
+    intern = sys.intern if base is str else None
+
+    for row, raw in enumerate(raws):
+        try:
+            v = load(raw)
+            if v is None:
+                continue
+            # defaults aren't parsed, so they may not be members or fit the array
+            if index is not None:
+                v = index[v]
+            elif intern is not None:
+                v = intern(v)
+            try:
+                values[row] = v
+            except OverflowError:
+                # too large for a fixed-width array; fall back to a list
+                values = list(values)
+                values[row] = v
+        except Exception as e:
+            errors.append(RowError(row, field.name, e))
+            continue
+        present[row] = 1
+    return values, present, members
+
+
+def _load_map_column(
+    map_field: MapField,
+    environs: List[Mapping[str, str]],
+    indexes: List[Optional[PrefixIndex]],
+    errors: List[RowError],
+) -> Tuple[List[Any], bytearray]:
+    present = bytearray(len(environs))
+    values: List[Any] = [None] * len(environs)
+    for row, environ in enumerate(environs):
+        index = indexes[row]
+        if index is None:
+            # one index per row, shared by all map fields
+            index = indexes[row] = PrefixIndex(environ)
+        try:
+            values[row] = map_field.parse(map_field.read(environ, index))
+        except Exception as e:
+            errors.append(RowError(row, map_field.name, e))
+            continue
+        present[row] = 1
+    return values, present
+
+
+def load_columns(
+    fields: Iterable[Field],
+    environs: Iterable[Mapping[str, str]],
+    maps: Iterable[MapField] = (),
+):
+    """
+    Load `environs` into a `Columns` object with one column per field and map
+    field.
+    """
+    environs = list(environs)
+    errors: List[RowError] = []
+    columns = {}
+    for field in fields:
+        varname = field.varname
+        raws = [environ.get(varname) for environ in environs]
+        values, present, members = _load_column(field, raws, errors)
+        columns[field.name] = Column(field, values, present, members)
+    indexes: List[Optional[PrefixIndex]] = [None] * len(environs)
+    for map_field in maps:
+        map_values, present = _load_map_column(map_field, environs, indexes, errors)
+        columns[map_field.name] = Column(map_field, map_values, present)
+    errors.sort(key=lambda e: e.row)
+    return Columns(columns, errors, len(environs))
@@ -0,0 +1,30 @@
+"""Minimal `.env` file reader (no interpolation, one `KEY=VALUE` per line)."""
+
+from typing import Dict
+
+_quotes = ("'", '"')
+
+
+def parse_env_lines(text: str) -> Dict[str, str]:
+    """Parse the contents of a `.env` file into a dict."""
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[len("export ") :].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in _quotes:
+            value = value[1:-1]
+        values[key.strip()] = value
+    return values
+
+
+def read_env_file(path: str) -> Dict[str, str]:
+    """Read a `.env` file into a dict."""
+    with open(path, encoding="utf-8") as f:
+        return parse_env_lines(f.read())
@@ -0,0 +1,183 @@
+"""
+File-backed field types for config that is really data, such as allowlists
+with hundreds of thousands of entries.
+
+The variable holds a path to a text file with one entry per line (blank lines
+are skipped, surrounding whitespace stripped). The file is memory-mapped and
+indexed lazily, on first access, and the same value object (with its index)
+is reused until the file's modification time or size changes; `refresh()`
+picks up new versions. Replace files atomically (e.g. by renaming a new file
+over the old one) rather than rewriting them in place.
+
+    class Config(Env):
+        allowed_ips: FileSet  # ALLOWED_IPS=/etc/app/allowed_ips.txt
+        tenant_ids: FileLines
+"""
+
+import mmap
+import os
+from array import array
+from collections.abc import Sequence, Set
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from yapeco import after_fork_in_child
+
+# the current value object per (type, path)
+_mapped_files: Dict[Tuple[type, str], "MappedFile"] = {}
+_mapped_files_lock = Lock()
+
+
+@after_fork_in_child
+def _reset_mapped_files_lock() -> None:
+    global _mapped_files_lock
+    _mapped_files_lock = Lock()
+
+
+def _file_version(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class MappedFile:
+    """Base class for file-backed field values."""
+
+    __slots__ = ("path", "version", "_mmap")
+
+    # re-checked on every refresh, even if the path did not change
+    __yapeco_volatile__ = True
+
+    def __init__(self, path: str, version: Tuple[int, int]) -> None:
+        self.path = path
+        self.version = version
+        self._mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def __yapeco_parser__(cls) -> Callable[[str], "MappedFile"]:
+        return partial(open_mapped_file, cls)
+
+    def _map(self) -> Any:
+        if self._mmap is None:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _lines(self) -> Iterator[Tuple[int, int]]:
+        """Yield `(start, end)` offsets of the stripped, non-blank lines."""
+        data = self._map()
+        size = len(data)
+        find = data.find
+        start = 0
+        while start < size:
+            end = find(b"\n", start)
+            if end < 0:
+                end = size
+            line = data[start:end]
+            stripped = line.strip()
+            if stripped:
+                offset = start + line.find(stripped)
+                yield offset, offset + len(stripped)
+            start = end + 1
+
+    def __repr__(self) -> str:
+        # with the version, so that snapshot fingerprints follow the file
+        return f"{type(self).__name__}({self.path!r}, version={self.version!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_restore_mapped_file, (type(self), self.path, self.version))
+
+
+class FileLines(MappedFile, Sequence):
+    """A read-only sequence of the lines of a file, indexed on first access."""
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, path: str, version: Tuple[int, int]) -> None:
+        super().__init__(path, version)
+        self._starts: Optional[array] = None
+        self._ends: Optional[array] = None
+
+    def _index(self) -> Tuple[array, array]:
+        if self._starts is None or self._ends is None:
+            starts = array("q")
+            ends = array("q")
+            for start, end in self._lines():
+                starts.append(start)
+                ends.append(end)
+            self._starts, self._ends = starts, ends
+        return self._starts, self._ends
+
+    def __len__(self) -> int:
+        return len(self._index()[0])
+
+    def __getitem__(self, index: Any) -> Any:
+        starts, ends = self._index()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(starts)))]
+        data = self._map()
+        return data[starts[index] : ends[index]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._map()
+        for start, end in zip(*self._index()):
+            yield data[start:end].decode("utf-8")
+
+
+class FileSet(MappedFile, Set):
+    """A read-only set of the lines of a file, hashed on first access."""
+
+    __slots__ = ("_set",)
+
+    def __init__(self, path: str, version: Tuple[int, int]) -> None:
+        super().__init__(path, version)
+        self._set: Optional[frozenset] = None
+
+    def _index(self) -> frozenset:
+        if self._set is None:
+            data = self._map()
+            self._set = frozenset(
+                data[start:end].decode("utf-8") for start, end in self._lines()
+            )
+        return self._set
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._index()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    __hash__ = Set._hash
+
+
+def open_mapped_file(cls: type, path: str) -> MappedFile:
+    """
+    Return the value object of type `cls` for the file at `path`, reusing the
+    previous one (and its index) if the file has not changed since.
+    """
+    version = _file_version(path)
+    key = (cls, path)
+    current = _mapped_files.get(key)
+    if current is not None and current.version == version:
+        return current
+    with _mapped_files_lock:
+        current = _mapped_files.get(key)
+        if current is None or current.version != version:
+            current = _mapped_files[key] = cls(path, version)
+    return current
+
+
+def _restore_mapped_file(cls: type, path: str, version: Tuple[int, int]) -> MappedFile:
+    # unpickle the version that was pickled, not whatever is at the path now
+    current = open_mapped_file(cls, path)
+    if current.version != tuple(version):
+        raise ValueError(
+            f"{path} changed since this {cls.__name__} was pickled "
+            f"(version {tuple(version)}, now {current.version})"
+        )
+    return current
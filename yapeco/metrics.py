@@ -0,0 +1,129 @@
+"""
+Refresh health metrics in the Prometheus text exposition format.
+
+Every config class counts its class-level refreshes (see `RefreshMetrics`);
+render them for a scrape handler, or write them to a node-exporter textfile:
+
+    from yapeco.metrics import render_metrics, write_textfile
+
+    body = render_metrics()  # all config classes
+    write_textfile("/var/lib/node_exporter/textfile/app.prom", Config)
+"""
+
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from yapeco import REFRESH_BUCKETS, RefreshMetrics, config_classes
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _merge(into: RefreshMetrics, metrics: RefreshMetrics) -> None:
+    into.refreshes += metrics.refreshes
+    into.errors += metrics.errors
+    into.fields_changed += metrics.fields_changed
+    into.last_success = max(into.last_success, metrics.last_success)
+    into.buckets = [a + b for a, b in zip(into.buckets, metrics.buckets)]
+    into.duration_sum += metrics.duration_sum
+
+
+def _samples(classes: Iterable[type]) -> List[Tuple[str, RefreshMetrics, int]]:
+    # classes with the same module and qualified name (e.g. created by one
+    # factory function) share a label: their series are merged, counters
+    # summed and gauges taking the highest value
+    merged: Dict[str, Tuple[RefreshMetrics, int]] = {}
+    for cls in classes:
+        label = _escape(f"{cls.__module__}.{cls.__qualname__}")
+        total, generation = merged.get(label) or (RefreshMetrics(), 0)
+        _merge(total, cls.__dict__["__yapeco_metrics__"])
+        generation = max(generation, cls.__dict__["__yapeco_generation__"])
+        merged[label] = (total, generation)
+    return [
+        (f'class="{label}"', metrics, generation)
+        for label, (metrics, generation) in sorted(merged.items())
+    ]
+
+
+def render_metrics(*classes: type) -> str:
+    """
+    Render the refresh metrics of `classes` (default: every config class) in
+    the Prometheus text exposition format.
+    """
+    samples = _samples(classes or config_classes())
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help: str, attr: str) -> None:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, metrics, generation in samples:
+            value = generation if attr == "generation" else getattr(metrics, attr)
+            lines.append(f"{name}{{{labels}}} {_number(value)}")
+
+    family(
+        "yapeco_refreshes_total",
+        "counter",
+        "Successful refreshes of a config class.",
+        "refreshes",
+    )
+    family(
+        "yapeco_refresh_errors_total",
+        "counter",
+        "Refreshes of a config class that raised.",
+        "errors",
+    )
+    family(
+        "yapeco_fields_changed_total",
+        "counter",
+        "Fields changed by refreshes of a config class.",
+        "fields_changed",
+    )
+    family(
+        "yapeco_generation",
+        "gauge",
+        "Number of refreshes that changed a value of a config class.",
+        "generation",
+    )
+    family(
+        "yapeco_last_success_timestamp_seconds",
+        "gauge",
+        "Unix time of the last successful refresh of a config class.",
+        "last_success",
+    )
+
+    name = "yapeco_refresh_duration_seconds"
+    lines.append(f"# HELP {name} Duration of refreshes of a config class.")
+    lines.append(f"# TYPE {name} histogram")
+    bounds = [_number(b) for b in REFRESH_BUCKETS] + ["+Inf"]
+    for labels, metrics, _ in samples:
+        # copy first, so the cumulative counts are consistent with each other
+        buckets = list(metrics.buckets)
+        total = 0
+        for bound, count in zip(bounds, buckets):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {_number(metrics.duration_sum)}")
+        lines.append(f"{name}_count{{{labels}}} {total}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, *classes: type) -> None:
+    """
+    Atomically write the refresh metrics of `classes` (default: every config
+    class) to `path`, e.g. a `.prom` file in node-exporter's textfile
+    collector directory.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render_metrics(*classes))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,296 @@
+"""
+Exportable field schemas and a standalone validator.
+
+A config class's resolved field plan can be exported to JSON with
+`export_schema()`/`write_schema()`. `validate_environ()` and `validate_files()`
+check environments against such a schema using only yapeco itself, without
+importing the application that defines the class.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from yapeco import (
+    Field,
+    FieldType,
+    JsonObject,
+    LazyJsonObject,
+    LazySequence,
+    MapField,
+    Plan,
+    PrefixIndex,
+    _collection_parsers,
+    _get_origin_and_args,
+    is_enum_type,
+    is_literal_type,
+    match_literal_value,
+    parse_bool_value,
+    parse_json_value,
+)
+from yapeco.envfile import parse_env_lines
+
+SCHEMA_VERSION = 1
+
+_collection_kinds: Dict[str, type] = {"list": list, "set": set, "frozenset": frozenset}
+
+_scalar_kinds: Dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": parse_bool_value,
+    "json": parse_json_value,
+}
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        value = value.value
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return repr(value)
+    return value
+
+
+def describe_type(base: Any) -> Dict[str, Any]:
+    """Describe a (non-optional) field type as a JSON-compatible dict."""
+    if base is bool:
+        return {"kind": "bool"}
+    if base is JsonObject or (
+        isinstance(base, type) and issubclass(base, LazyJsonObject)
+    ):
+        return {"kind": "json"}
+    if is_enum_type(base):
+        return {
+            "kind": "enum",
+            "name": base.__qualname__,
+            "members": [_json_value(member.value) for member in base],
+        }
+    if is_literal_type(base):
+        _, args = _get_origin_and_args(base)
+        return {"kind": "literal", "members": [_json_value(a) for a in args]}
+    if base in (str, int, float):
+        return {"kind": base.__name__}
+    if isinstance(base, type) and hasattr(base, "__yapeco_parser__"):
+        # e.g. file paths, which are not checked on the validating host
+        return {"kind": "str", "name": base.__qualname__}
+    origin, args = _get_origin_and_args(base)
+    if origin in _collection_parsers and len(args) == 1:
+        if args[0] in (str, int, float):
+            # lazy sequences validate like lists; laziness is a loading detail
+            kind = "list" if origin is LazySequence else origin.__name__
+            return {"kind": kind, "element": args[0].__name__}
+    return {"kind": "unsupported"}
+
+
+def _flat_fields(plan: Plan) -> Iterator[Field]:
+    yield from plan.fields
+    for group in plan.groups:
+        yield from _flat_fields(group.plan)
+
+
+def _flat_maps(plan: Plan) -> Iterator[MapField]:
+    yield from plan.maps
+    for group in plan.groups:
+        yield from _flat_maps(group.plan)
+
+
+def export_schema(cls) -> Dict[str, Any]:
+    """
+    Export the resolved field plan of a config class. Fields and map fields
+    of nested groups are included under their prefixed variable names.
+    """
+    fields = []
+    for field in _flat_fields(cls.__yapeco_plan__):
+        fields.append(
+            {
+                "name": field.name,
+                "varname": field.varname,
+                "annotation": str(field.type.annotation),
+                "optional": field.type.optional,
+                "default": _json_value(field.default),
+                "type": describe_type(field.type.base),
+            }
+        )
+    maps = []
+    for map_field in _flat_maps(cls.__yapeco_plan__):
+        maps.append(
+            {
+                "name": map_field.name,
+                "prefix": map_field.prefix,
+                "suffix": map_field.suffix,
+                "annotation": str(map_field.type.annotation),
+                "optional": map_field.type.optional,
+                "type": describe_type(map_field.type.base),
+            }
+        )
+    return {
+        "yapeco_schema": SCHEMA_VERSION,
+        "class": f"{cls.__module__}:{cls.__qualname__}",
+        "fields": fields,
+        "maps": maps,
+    }
+
+
+def write_schema(cls, path: str) -> None:
+    """Write the schema of a config class to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(export_schema(cls), f, indent=2)
+        f.write("\n")
+
+
+def read_schema(path: str) -> Dict[str, Any]:
+    """Read a schema written by `write_schema()`."""
+    with open(path, encoding="utf-8") as f:
+        schema = json.load(f)
+    if schema.get("yapeco_schema") != SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported schema version {schema.get('yapeco_schema')!r} in {path}"
+        )
+    return schema
+
+
+def _parse_enum_value(name: str, members: Tuple[Any, ...], value_str: str) -> str:
+    if value_str not in members:
+        raise ValueError(f"'{value_str}' is not a valid {name}")
+    return value_str
+
+
+def _type_parser(desc: Dict[str, Any]) -> Optional[Callable[[str], Any]]:
+    kind = desc["kind"]
+    if kind in _scalar_kinds:
+        return _scalar_kinds[kind]
+    if kind in ("list", "set", "frozenset"):
+        parse = _collection_parsers[_collection_kinds[kind]]
+        return partial(parse, _scalar_kinds[desc["element"]])
+    if kind == "literal":
+        return partial(match_literal_value, tuple(desc["members"]))
+    if kind == "enum":
+        return partial(_parse_enum_value, desc["name"], tuple(desc["members"]))
+    return None
+
+
+def _schema_type(f: Mapping[str, Any]) -> FieldType:
+    desc = f["type"]
+    empty = None
+    if f["optional"] and desc["kind"] in _collection_kinds:
+        empty = _collection_kinds[desc["kind"]]
+    return FieldType(f["annotation"], None, f["optional"], _type_parser(desc), empty)
+
+
+def schema_fields(schema: Mapping[str, Any]) -> Tuple[Field, ...]:
+    """Rebuild loadable fields from a schema."""
+    return tuple(
+        Field(f["name"], f["varname"], _schema_type(f), f["default"])
+        for f in schema["fields"]
+    )
+
+
+def schema_maps(schema: Mapping[str, Any]) -> Tuple[MapField, ...]:
+    """Rebuild loadable map fields from a schema (older schemas have none)."""
+    return tuple(
+        MapField(m["name"], m["prefix"], m["suffix"], _schema_type(m))
+        for m in schema.get("maps", ())
+    )
+
+
+def _schema_members(schema: Mapping[str, Any]) -> Tuple[Any, ...]:
+    return schema_fields(schema) + schema_maps(schema)
+
+
+def _validate_fields(
+    fields: Iterable[Union[Field, MapField]], environ: Mapping[str, str]
+) -> List[str]:
+    errors = []
+    get = environ.get
+    index = None
+    for field in fields:
+        if isinstance(field, MapField):
+            if index is None:
+                index = PrefixIndex(environ)
+            for varname, raw in field.read(environ, index):
+                try:
+                    field.parse(((varname, raw),))
+                except Exception as e:
+                    errors.append(f"{varname}: {type(e).__name__}: {e}")
+            continue
+        try:
+            field.load(get(field.varname))
+        except Exception as e:
+            errors.append(f"{field.varname}: {type(e).__name__}: {e}")
+    return errors
+
+
+def validate_environ(schema: Mapping[str, Any], environ: Mapping[str, str]):
+    """Validate one environment mapping, returning a list of error messages."""
+    return _validate_fields(_schema_members(schema), environ)
+
+
+def read_environ_dump(path: str) -> Dict[str, str]:
+    """
+    Read an environment from a `.env` file, a JSON object, or a NUL-separated
+    dump such as `/proc/<pid>/environ`.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        return json.loads(text)
+    if "\0" in text:
+        entries = (entry.partition("=") for entry in text.split("\0") if entry)
+        return {key: value for key, _, value in entries}
+    return parse_env_lines(text)
+
+
+_worker_fields: Tuple[Any, ...] = ()
+
+
+def _init_worker(schema: Mapping[str, Any]) -> None:
+    global _worker_fields
+    _worker_fields = _schema_members(schema)
+
+
+def _validate_path(path: str, fields: Optional[Tuple[Any, ...]] = None):
+    try:
+        environ = read_environ_dump(path)
+    except (OSError, ValueError) as e:
+        return [f"{type(e).__name__}: {e}"]
+    return _validate_fields(_worker_fields if fields is None else fields, environ)
+
+
+def validate_files(
+    schema: Mapping[str, Any],
+    paths: Iterable[str],
+    processes: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """
+    Validate many environment files against a schema, returning errors per
+    path. Files are checked on a process pool with `processes` workers
+    (default: CPU count); pass `processes=1` to validate in this process.
+    """
+    paths = list(paths)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(paths))
+    if processes <= 1:
+        fields = _schema_members(schema)
+        return {path: _validate_path(path, fields) for path in paths}
+    chunksize = max(1, len(paths) // (processes * 4))
+    with ProcessPoolExecutor(
+        processes, initializer=_init_worker, initargs=(schema,)
+    ) as pool:
+        return dict(zip(paths, pool.map(_validate_path, paths, chunksize=chunksize)))
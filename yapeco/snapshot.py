@@ -0,0 +1,194 @@
+"""
+Frozen config snapshots, for handing config to worker processes.
+
+A `Snapshot` holds the values of a config class (or instance) at one point in
+time. It is immutable and hashable, and pickles to a compact, version-tagged
+form that is restored without importing or re-creating the config class (only
+the types of the values themselves, such as enums, are imported by reference).
+Its `fingerprint` identifies the values, so a worker that already holds a
+snapshot with the same fingerprint can skip reloading.
+"""
+
+from hashlib import blake2b
+from time import sleep
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Tuple
+
+SNAPSHOT_VERSION = 1
+
+# name -> index lookups, shared by snapshots with the same fields
+_indexes: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return tuple(_thaw(v) for v in value)
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+class Snapshot:
+    """Immutable values of a config at one point in time."""
+
+    __slots__ = ("config", "names", "values", "generation", "fingerprint", "_index")
+
+    config: str
+    names: Tuple[str, ...]
+    values: Tuple[Any, ...]
+    generation: int
+    fingerprint: str
+
+    def __init__(
+        self,
+        config: str,
+        names: Tuple[str, ...],
+        values: Tuple[Any, ...],
+        generation: int,
+        fingerprint: str,
+    ) -> None:
+        index = _indexes.get(names)
+        if index is None:
+            index = _indexes.setdefault(names, {n: i for i, n in enumerate(names)})
+        set_ = object.__setattr__
+        set_(self, "config", config)
+        set_(self, "names", names)
+        set_(self, "values", values)
+        set_(self, "generation", generation)
+        set_(self, "fingerprint", fingerprint)
+        set_(self, "_index", index)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.values[self._index[name]]
+        except KeyError:
+            raise AttributeError(
+                f"Snapshot of {self.config} has no field {name!r}"
+            ) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Snapshot is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Snapshot is immutable")
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.names, self.values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Values as a (mutable) dict, with nested snapshots kept as-is."""
+        return {name: _thaw(value) for name, value in self}
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Snapshot):
+            return NotImplemented
+        return self.config == other.config and self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+    def __repr__(self) -> str:
+        return (
+            f"Snapshot({self.config}, generation={self.generation}, "
+            f"fingerprint={self.fingerprint!r})"
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            _restore_snapshot,
+            (
+                SNAPSHOT_VERSION,
+                self.config,
+                self.names,
+                tuple(_thaw(v) for v in self.values),
+                self.generation,
+                self.fingerprint,
+            ),
+        )
+
+
+def _restore_snapshot(
+    version: int,
+    config: str,
+    names: Tuple[str, ...],
+    values: Tuple[Any, ...],
+    generation: int,
+    fingerprint: str,
+) -> Snapshot:
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    return Snapshot(
+        config, names, tuple(_freeze(v) for v in values), generation, fingerprint
+    )
+
+
+def _canonical_repr(value: Any) -> str:
+    """A representation of `value` that is stable across processes."""
+    if isinstance(value, (list, tuple)):
+        return "(" + ",".join(_canonical_repr(v) for v in value) + ")"
+    if isinstance(value, (dict, MappingProxyType)):
+        items = (f"{k!r}:{_canonical_repr(v)}" for k, v in value.items())
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_canonical_repr(v) for v in value)) + "}"
+    if isinstance(value, Snapshot):
+        return f"Snapshot({value.fingerprint})"
+    return repr(value)
+
+
+def _generation(target: Any) -> int:
+    if isinstance(target, type):
+        return sum(
+            base.__dict__.get("__yapeco_generation__", 0) for base in target.__mro__
+        )
+    return target.__dict__.get("__yapeco_generation__", 0)
+
+
+def _seqs(target: Any) -> Tuple[int, ...]:
+    if isinstance(target, type):
+        return tuple(base.__dict__.get("__yapeco_seq__", 0) for base in target.__mro__)
+    return (target.__dict__.get("__yapeco_seq__", 0),)
+
+
+def take_snapshot(target: Any) -> Snapshot:
+    """
+    Snapshot the current values of a config class or instance. The values of
+    each class (or group) are read consistently, without locking: if a
+    refresh publishes values meanwhile, they are read again.
+    """
+    cls = target if isinstance(target, type) else type(target)
+    plan = cls.__yapeco_plan__
+    names = [member.name for member in plan.fields + plan.maps]
+    while True:
+        seqs = _seqs(target)
+        if any(seq % 2 for seq in seqs):
+            # a refresh is publishing values
+            sleep(0)
+            continue
+        values = [getattr(target, name) for name in names]
+        generation = _generation(target)
+        if _seqs(target) == seqs:
+            break
+    for group in plan.groups:
+        names.append(group.name)
+        values.append(take_snapshot(getattr(target, group.name)))
+    config = f"{cls.__module__}:{cls.__qualname__}"
+    canonical = _canonical_repr((config, names, values))
+    digest = blake2b(canonical.encode("utf-8", "backslashreplace"), digest_size=16)
+    return Snapshot(
+        config,
+        tuple(names),
+        tuple(_freeze(v) for v in values),
+        generation,
+        digest.hexdigest(),
+    )
@@ -0,0 +1,371 @@
+"""
+Layered configuration sources.
+
+A `LayeredSource` merges layers (lowest precedence first) into one mapping
+that config classes read instead of `os.environ`:
+
+    from yapeco.sources import DictLayer, EnvFileLayer, EnvironLayer, LayeredSource
+
+    overrides = DictLayer("overrides")
+    source = LayeredSource(
+        DictLayer("defaults", {"PORT": "8080"}),
+        EnvFileLayer(".env"),
+        EnvFileLayer("/etc/app/host.env"),
+        EnvironLayer(),
+        overrides,
+    )
+
+    class Config(Env, source=source):
+        port: int
+
+Each layer has a version stamp; on refresh, only the keys of layers whose
+stamp changed are re-merged. `provenance(Config)` tells which layer each
+field's value came from.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from re import compile as compile_regex
+from threading import Lock, local
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+from weakref import WeakSet, WeakValueDictionary
+
+from yapeco import Plan, PrefixIndex, _class_environ, after_fork_in_child
+from yapeco.envfile import read_env_file
+
+
+class Layer(ABC):
+    """A named set of variables with a version stamp."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+    @abstractmethod
+    def version(self) -> Hashable:
+        """A stamp that changes whenever the values of the layer may have."""
+
+    @abstractmethod
+    def read(self) -> Dict[str, str]:
+        """The current values of the layer."""
+
+
+class DictLayer(Layer):
+    """
+    In-memory values, e.g. defaults or runtime overrides. Change them through
+    `set()`, `unset()` and `update()` so that the version stamp follows.
+    """
+
+    def __init__(self, name: str, values: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(name)
+        self._values = dict(values or {})
+        self._version = 0
+
+    def version(self) -> Hashable:
+        return self._version
+
+    def read(self) -> Dict[str, str]:
+        return dict(self._values)
+
+    def set(self, key: str, value: str) -> None:
+        self._values[key] = value
+        self._version += 1
+
+    def unset(self, key: str) -> None:
+        self._values.pop(key, None)
+        self._version += 1
+
+    def update(self, values: Dict[str, str]) -> None:
+        self._values.update(values)
+        self._version += 1
+
+
+class EnvFileLayer(Layer):
+    """
+    A `.env` file, versioned by its mtime, size and inode. A missing file is
+    an empty layer.
+    """
+
+    def __init__(self, path: str, name: Optional[str] = None) -> None:
+        super().__init__(path if name is None else name)
+        self.path = path
+
+    def version(self) -> Hashable:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def read(self) -> Dict[str, str]:
+        try:
+            return read_env_file(self.path)
+        except FileNotFoundError:
+            return {}
+
+
+class EnvironLayer(Layer):
+    """
+    `os.environ`. It has no cheap version stamp, so each refresh copies it
+    and compares the copy with the previous one (both C-level dict
+    operations), counting changes.
+    """
+
+    def __init__(self, name: str = "environ") -> None:
+        super().__init__(name)
+        self._values: Dict[str, str] = {}
+        self._version = 0
+
+    def version(self) -> Hashable:
+        values = dict(os.environ)
+        if values != self._values:
+            self._values = values
+            self._version += 1
+        return self._version
+
+    def read(self) -> Dict[str, str]:
+        return self._values
+
+
+_identifier_re = compile_regex(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _identifier(name: str) -> str:
+    if not _identifier_re.match(name):
+        raise ValueError(f"Invalid SQL identifier {name!r}")
+    return f'"{name}"'
+
+
+class SqliteLayer(Layer):
+    """
+    Key/value rows of a table in a SQLite database written by another
+    process. Each thread reads through its own read-only connection.
+
+    Whether anything changed is decided by one cheap query per refresh,
+    `PRAGMA data_version` by default (or `version_query`, e.g. selecting a
+    version row). If the table has a `version_column` (increasing on every
+    write), only rows with a newer version than the last seen one are
+    fetched, and rows with a `NULL` value remove their key; otherwise the
+    whole table is re-read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "config",
+        key_column: str = "key",
+        value_column: str = "value",
+        version_column: Optional[str] = None,
+        version_query: str = "PRAGMA data_version",
+        name: Optional[str] = None,
+    ) -> None:
+        super().__init__(path if name is None else name)
+        self.path = path
+        self.version_query = version_query
+        columns = f"{_identifier(key_column)}, {_identifier(value_column)}"
+        if version_column is None:
+            self._select = f"SELECT {columns} FROM {_identifier(table)}"
+        else:
+            version = _identifier(version_column)
+            self._select = (
+                f"SELECT {columns}, {version} FROM {_identifier(table)} "
+                f"WHERE {version} > ? ORDER BY {version}"
+            )
+        self._incremental = version_column is not None
+        self._row_version: Any = None
+        self._values: Dict[str, str] = {}
+        self._version = 0
+        self._lock = Lock()
+        self._local = local()
+        _sqlite_layers.add(self)
+
+    def _connection(self) -> Any:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.conn = conn
+            self._local.seen = None
+        return conn
+
+    def version(self) -> Hashable:
+        conn = self._connection()
+        # `data_version` is per connection, so what was seen is too
+        seen = conn.execute(self.version_query).fetchone()
+        if seen == self._local.seen:
+            return self._version
+        with self._lock:
+            if self._incremental:
+                rows = conn.execute(self._select, (self._row_version or 0,))
+                changed = False
+                for key, value, row_version in rows:
+                    if value is None:
+                        changed |= self._values.pop(key, None) is not None
+                    elif self._values.get(key) != str(value):
+                        self._values[key] = str(value)
+                        changed = True
+                    self._row_version = row_version
+            else:
+                values = {key: str(value) for key, value in conn.execute(self._select)}
+                changed = values != self._values
+                self._values = values
+            if changed:
+                self._version += 1
+            self._local.seen = seen
+            return self._version
+
+    def read(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._values)
+
+
+_sqlite_layers: "WeakSet[SqliteLayer]" = WeakSet()
+
+
+@after_fork_in_child
+def _reset_sqlite_connections() -> None:
+    # connections must not be shared with the parent
+    for layer in list(_sqlite_layers):
+        layer._lock = Lock()
+        layer._local = local()
+
+
+_unread = object()
+
+
+class LayeredSource(Mapping):
+    """
+    A read-only mapping merging `layers`, later layers taking precedence.
+    Config classes using it as their `source` bring it up to date on every
+    class-level `refresh()`. Refreshes are serialised; reads don't lock, as
+    a refresh replaces the merged mapping instead of changing it.
+    """
+
+    def __init__(self, *layers: Layer) -> None:
+        self.layers = layers
+        self._versions: List[Any] = [_unread] * len(layers)
+        self._values: List[Dict[str, str]] = [{} for _ in layers]
+        # (merged values, index of the layer each came from), never mutated
+        self._state: Tuple[Dict[str, str], Dict[str, int]] = ({}, {})
+        self._lock = Lock()
+        _layered_sources[id(self)] = self
+        self.refresh()
+
+    def refresh(self) -> Set[str]:
+        """
+        Re-read layers whose version changed and re-merge their keys. Returns
+        the keys whose merged value changed.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> Set[str]:
+        keys: Set[str] = set()
+        for i, layer in enumerate(self.layers):
+            # stamp first: if the layer changes while being read, the next
+            # refresh sees a new stamp and reads it again
+            version = layer.version()
+            if version == self._versions[i]:
+                continue
+            old, new = self._values[i], dict(layer.read())
+            keys.update(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+            self._versions[i] = version
+            self._values[i] = new
+        if not keys:
+            return set()
+
+        changed = set()
+        merged, origins = dict(self._state[0]), dict(self._state[1])
+        for key in keys:
+            for i in range(len(self.layers) - 1, -1, -1):
+                value = self._values[i].get(key)
+                if value is not None:
+                    origins[key] = i
+                    break
+            else:
+                value = None
+                origins.pop(key, None)
+            if merged.get(key) != value:
+                changed.add(key)
+                if value is None:
+                    del merged[key]
+                else:
+                    merged[key] = value
+        self._state = (merged, origins)
+        return changed
+
+    def versions(self) -> Dict[str, Hashable]:
+        """The version stamp of each layer, as of the last refresh."""
+        return {layer.name: v for layer, v in zip(self.layers, self._versions)}
+
+    def origin(self, key: str) -> Optional[Layer]:
+        """The layer the merged value of `key` came from, if it is set."""
+        i = self._state[1].get(key)
+        return None if i is None else self.layers[i]
+
+    def __getitem__(self, key: str) -> str:
+        return self._state[0][key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._state[0].get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._state[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._state[0])
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    def __repr__(self) -> str:
+        return f"LayeredSource{self.layers!r}"
+
+
+# by id: mappings aren't hashable
+_layered_sources: "WeakValueDictionary[int, LayeredSource]" = WeakValueDictionary()
+
+
+@after_fork_in_child
+def _reset_source_locks() -> None:
+    for source in list(_layered_sources.values()):
+        source._lock = Lock()
+
+
+def _provenance(
+    plan: Plan,
+    source: LayeredSource,
+    index: PrefixIndex,
+    prefix: str,
+    out: Dict[str, Optional[str]],
+) -> None:
+    for field in plan.fields:
+        layer = source.origin(field.varname)
+        out[prefix + field.name] = None if layer is None else layer.name
+    for map_field in plan.maps:
+        start = len(map_field.prefix)
+        stop = -len(map_field.suffix) or None
+        for varname in index.match(map_field.prefix, map_field.suffix):
+            layer = source.origin(varname)
+            key = f"{prefix}{map_field.name}[{varname[start:stop]}]"
+            out[key] = None if layer is None else layer.name
+    for group in plan.groups:
+        _provenance(group.plan, source, index, f"{prefix}{group.name}.", out)
+
+
+def provenance(cls) -> Dict[str, Optional[str]]:
+    """
+    The name of the layer each field of `cls` was read from (`None` for unset
+    fields), as of the last refresh of its source. Fields of nested groups
+    are named `group.field`, and entries of map fields `field[KEY]`.
+    """
+    source = _class_environ(cls)
+    if not isinstance(source, LayeredSource):
+        raise TypeError(f"{cls.__qualname__} does not read a LayeredSource")
+    out: Dict[str, Optional[str]] = {}
+    _provenance(cls.__yapeco_plan__, source, PrefixIndex(source), "", out)
+    return out